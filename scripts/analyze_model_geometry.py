@@ -4,75 +4,141 @@ Advanced GLB Model Geometry Analysis
 Examines actual mesh structure to find logical hardpoint positions
 """
 
+import math
+import os
+import sys
 import trimesh
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from mpl_toolkits.mplot3d import Axes3D
+from glb_loader import load_or_cache
+from jit import njit
 
-def analyze_model_geometry(file_path, model_name):
+@njit(cache=True, fastmath=True)
+def _cross_sections(v, zs, tol):
+    """Single pass over the vertices collecting count and X/Y extents per Z slice"""
+    n_slices = zs.shape[0]
+    counts = np.zeros(n_slices, dtype=np.int64)
+    x_min = np.zeros(n_slices)
+    x_max = np.zeros(n_slices)
+    y_min = np.zeros(n_slices)
+    y_max = np.zeros(n_slices)
+    
+    zmin = zs[0]
+    # A flat model (or a single slice) has no spacing, so every slice is a candidate
+    bin_width = (zs[n_slices - 1] - zmin) / (n_slices - 1) if n_slices > 1 else 0.0
+    
+    for i in range(v.shape[0]):
+        x = v[i, 0]
+        y = v[i, 1]
+        z = v[i, 2]
+        
+        # Only the slices whose tolerance window can contain this vertex
+        k_lo = 0
+        k_hi = n_slices - 1
+        if bin_width > 0:
+            k_lo = max(int(math.ceil((z - tol - zmin) / bin_width)), 0)
+            k_hi = min(int(math.floor((z + tol - zmin) / bin_width)), n_slices - 1)
+        
+        for k in range(k_lo, k_hi + 1):
+            if abs(z - zs[k]) >= tol:
+                continue
+            if counts[k] == 0:
+                x_min[k] = x
+                x_max[k] = x
+                y_min[k] = y
+                y_max[k] = y
+            else:
+                if x < x_min[k]:
+                    x_min[k] = x
+                elif x > x_max[k]:
+                    x_max[k] = x
+                if y < y_min[k]:
+                    y_min[k] = y
+                elif y > y_max[k]:
+                    y_max[k] = y
+            counts[k] += 1
+    
+    return counts, x_min, x_max, y_min, y_max
+
+def load_meshes(file_path):
+    """Load a model and return the Trimesh objects it contains"""
+    scene = trimesh.load(file_path)
+    
+    if isinstance(scene, trimesh.Scene):
+        # Get all mesh objects from scene
+        meshes = [mesh for mesh in scene.geometry.values() if isinstance(mesh, trimesh.Trimesh)]
+        print(f"Scene contains {len(meshes)} mesh objects")
+    else:
+        meshes = [scene]
+        print("Single mesh object")
+    
+    return meshes
+
+def analyze_model_geometry(file_path, model_name, need_volume=False):
     """Deep analysis of model geometry to understand actual shape"""
     print(f"\n{'='*60}")
     print(f"DETAILED GEOMETRY ANALYSIS: {model_name}")
     print(f"{'='*60}")
     
     try:
-        # Load the model
-        scene = trimesh.load(file_path)
-        
-        if isinstance(scene, trimesh.Scene):
-            # Get all mesh objects from scene
-            meshes = [mesh for mesh in scene.geometry.values() if isinstance(mesh, trimesh.Trimesh)]
-            print(f"Scene contains {len(meshes)} mesh objects")
-            
-            # Combine all meshes
+        if need_volume:
+            # Volume and area need a real fused mesh
+            meshes = load_meshes(file_path)
             if len(meshes) > 1:
                 combined = trimesh.util.concatenate(meshes)
             else:
                 combined = meshes[0]
         else:
-            combined = scene
-            print("Single mesh object")
+            # Hardpoint analysis only reads vertices, bounds and centroid - skip fusing the meshes
+            combined = load_or_cache(file_path)
+            # The cached float32 positions widen exactly, and the analysis below works in float64
+            combined.vertices = combined.vertices.astype(np.float64)
         
         # Basic properties
         print(f"Vertices: {len(combined.vertices)}")
         print(f"Faces: {len(combined.faces)}")
-        print(f"Volume: {combined.volume:.3f}")
-        print(f"Surface Area: {combined.area:.3f}")
+        if need_volume:
+            print(f"Volume: {combined.volume:.3f}")
+            print(f"Surface Area: {combined.area:.3f}")
         
         # Detailed bounding analysis
         bounds = combined.bounds
         center = combined.centroid
+        (xmin, ymin, zmin), (xmax, ymax, zmax) = bounds.tolist()
+        center_z = float(center[2])
+        z_span = zmax - zmin
         print(f"Centroid: [{center[0]:.3f}, {center[1]:.3f}, {center[2]:.3f}]")
-        print(f"Bounds: X[{bounds[0][0]:.3f}, {bounds[1][0]:.3f}]")
-        print(f"        Y[{bounds[0][1]:.3f}, {bounds[1][1]:.3f}]")
-        print(f"        Z[{bounds[0][2]:.3f}, {bounds[1][2]:.3f}]")
+        print(f"Bounds: X[{xmin:.3f}, {xmax:.3f}]")
+        print(f"        Y[{ymin:.3f}, {ymax:.3f}]")
+        print(f"        Z[{zmin:.3f}, {zmax:.3f}]")
         
         # Analyze geometry distribution
         vertices = combined.vertices
         
         # Find vertices by position characteristics
-        front_vertices = vertices[vertices[:, 2] < center[2] - (bounds[1][2] - bounds[0][2]) * 0.3]
-        rear_vertices = vertices[vertices[:, 2] > center[2] + (bounds[1][2] - bounds[0][2]) * 0.3]
+        front_vertices = vertices[vertices[:, 2] < center_z - z_span * 0.3]
+        rear_vertices = vertices[vertices[:, 2] > center_z + z_span * 0.3]
         
         print(f"\nGeometry Distribution:")
         print(f"Front section vertices: {len(front_vertices)}")
         print(f"Rear section vertices: {len(rear_vertices)}")
         
         # Analyze cross-sections at different Z positions
-        z_positions = np.linspace(bounds[0][2], bounds[1][2], 10)
+        z_positions = np.linspace(zmin, zmax, 10)
+        tolerance = z_span * 0.05
+        counts, x_min, x_max, y_min, y_max = _cross_sections(
+            np.ascontiguousarray(vertices, dtype=np.float64), z_positions, tolerance)
         cross_sections = []
         
-        for z in z_positions:
-            tolerance = (bounds[1][2] - bounds[0][2]) * 0.05
-            slice_vertices = vertices[np.abs(vertices[:, 2] - z) < tolerance]
-            if len(slice_vertices) > 0:
-                x_range = slice_vertices[:, 0].max() - slice_vertices[:, 0].min()
-                y_range = slice_vertices[:, 1].max() - slice_vertices[:, 1].min()
+        for i, z in enumerate(z_positions):
+            if counts[i] > 0:
                 cross_sections.append({
                     'z': z,
-                    'vertices': len(slice_vertices),
-                    'x_range': x_range,
-                    'y_range': y_range
+                    'vertices': int(counts[i]),
+                    'x_range': x_max[i] - x_min[i],
+                    'y_range': y_max[i] - y_min[i]
                 })
         
         print(f"\nCross-section Analysis:")
@@ -98,6 +164,15 @@ def analyze_model_geometry(file_path, model_name):
         print(f"Error analyzing {model_name}: {e}")
         return None
 
+def _lateral_clusters(region, center_x, margin):
+    """Count and mean position of the vertices left and right of center_x +/- margin, in one bincount pass"""
+    x = region[:, 0]
+    code = np.where(x < center_x - margin, 0, np.where(x > center_x + margin, 2, 1))
+    counts = np.bincount(code, minlength=3)
+    sums = np.stack([np.bincount(code, weights=region[:, i], minlength=3) for i in range(3)], axis=1)
+    means = sums / np.maximum(counts, 1)[:, None]
+    return (counts[0], means[0]), (counts[2], means[2])
+
 def find_logical_hardpoints(mesh, model_name):
     """Find logical positions for weapons and thrusters based on actual geometry"""
     bounds = mesh.bounds
@@ -110,26 +185,27 @@ def find_logical_hardpoints(mesh, model_name):
     }
     
     # Define search regions
-    front_z = bounds[0][2]
-    rear_z = bounds[1][2]
-    center_z = center[2]
+    front_z = float(bounds[0, 2])
+    rear_z = float(bounds[1, 2])
+    center_z = float(center[2])
+    z_margin = (rear_z - front_z) * 0.2
     
     # More conservative approach - look for actual geometric features
-    front_region = vertices[vertices[:, 2] < center_z - (rear_z - front_z) * 0.2]
-    rear_region = vertices[vertices[:, 2] > center_z + (rear_z - front_z) * 0.2]
+    # Sort once by Z so the front and rear regions are contiguous slices found by binary search
+    order = np.argsort(vertices[:, 2])
+    sorted_vertices = vertices[order]
+    sorted_z = sorted_vertices[:, 2]
+    front_region = sorted_vertices[:np.searchsorted(sorted_z, center_z - z_margin, side='left')]
+    rear_region = sorted_vertices[np.searchsorted(sorted_z, center_z + z_margin, side='right'):]
     
     if len(front_region) > 0:
-        # Find weapon positions in front region
-        front_center = np.mean(front_region, axis=0)
+        # Find weapon positions in front region (bounding-box midpoint - the extremes define the tips)
+        front_center = 0.5 * (front_region.min(axis=0) + front_region.max(axis=0))
         
         # Look for symmetrical positions
-        front_left = front_region[front_region[:, 0] < front_center[0] - 2]
-        front_right = front_region[front_region[:, 0] > front_center[0] + 2]
+        (left_count, left_pos), (right_count, right_pos) = _lateral_clusters(front_region, front_center[0], 2)
         
-        if len(front_left) > 0 and len(front_right) > 0:
-            left_pos = np.mean(front_left, axis=0)
-            right_pos = np.mean(front_right, axis=0)
-            
+        if left_count > 0 and right_count > 0:
             hardpoints['weapons'] = [
                 {'position': right_pos, 'type': 'cannon'},
                 {'position': left_pos, 'type': 'cannon'}
@@ -142,7 +218,7 @@ def find_logical_hardpoints(mesh, model_name):
     
     if len(rear_region) > 0:
         # Find engine positions in rear region
-        rear_center = np.mean(rear_region, axis=0)
+        rear_center = 0.5 * (rear_region.min(axis=0) + rear_region.max(axis=0))
         
         # Main engine at center
         hardpoints['engines'] = [
@@ -150,13 +226,9 @@ def find_logical_hardpoints(mesh, model_name):
         ]
         
         # Look for secondary engine positions
-        rear_left = rear_region[rear_region[:, 0] < rear_center[0] - 3]
-        rear_right = rear_region[rear_region[:, 0] > rear_center[0] + 3]
+        (left_count, left_engine), (right_count, right_engine) = _lateral_clusters(rear_region, rear_center[0], 3)
         
-        if len(rear_left) > 5 and len(rear_right) > 5:
-            left_engine = np.mean(rear_left, axis=0)
-            right_engine = np.mean(rear_right, axis=0)
-            
+        if left_count > 5 and right_count > 5:
             hardpoints['engines'].extend([
                 {'position': right_engine, 'type': 'secondary', 'scale': 0.7},
                 {'position': left_engine, 'type': 'secondary', 'scale': 0.7}
@@ -178,7 +250,9 @@ def find_logical_hardpoints(mesh, model_name):
 def create_model_visualization(mesh, hardpoints, model_name):
     """Create a 3D visualization of the model with hardpoints"""
     try:
-        fig = plt.figure(figsize=(15, 10))
+        # constrained_layout replaces the iterative tight_layout pass
+        fig = Figure(figsize=(15, 10), constrained_layout=True)
+        FigureCanvasAgg(fig)
         
         # 3D scatter plot of vertices
         ax1 = fig.add_subplot(221, projection='3d')
@@ -186,70 +260,47 @@ def create_model_visualization(mesh, hardpoints, model_name):
         
         # Sample vertices for visualization (too many to plot all)
         sample_size = min(1000, len(vertices))
-        sample_indices = np.random.choice(len(vertices), sample_size, replace=False)
-        sample_vertices = vertices[sample_indices]
+        sample_indices = np.random.default_rng(0).choice(len(vertices), sample_size, replace=False)
         
-        ax1.scatter(sample_vertices[:, 0], sample_vertices[:, 1], sample_vertices[:, 2], 
-                   alpha=0.6, s=1, c=sample_vertices[:, 2], cmap='viridis')
+        # Transpose the sample once; every view reads contiguous per-axis rows of it
+        sample_axes = np.ascontiguousarray(vertices[sample_indices].T)
+        sx, sy, sz = sample_axes
         
-        # Plot hardpoints
-        for wp in hardpoints['weapons']:
-            pos = wp['position']
-            ax1.scatter([pos[0]], [pos[1]], [pos[2]], color='red', s=100, marker='^')
+        # Hardpoints stacked once so each view draws them with one call per kind
+        weapon_positions = np.array([wp['position'] for wp in hardpoints['weapons']]).reshape(-1, 3)
+        engine_positions = np.array([ep['position'] for ep in hardpoints['engines']]).reshape(-1, 3)
         
-        for ep in hardpoints['engines']:
-            pos = ep['position']
-            ax1.scatter([pos[0]], [pos[1]], [pos[2]], color='orange', s=100, marker='o')
+        ax1.scatter(sx, sy, sz, alpha=0.6, s=1, c=sz, cmap='viridis')
+        
+        # Plot hardpoints
+        ax1.scatter(weapon_positions[:, 0], weapon_positions[:, 1], weapon_positions[:, 2],
+                   color='red', s=100, marker='^')
+        ax1.scatter(engine_positions[:, 0], engine_positions[:, 1], engine_positions[:, 2],
+                   color='orange', s=100, marker='o')
         
         ax1.set_title(f'{model_name} - 3D Structure')
         ax1.set_xlabel('X')
         ax1.set_ylabel('Y')
         ax1.set_zlabel('Z')
         
-        # Top view (X-Z plane)
-        ax2 = fig.add_subplot(222)
-        ax2.scatter(sample_vertices[:, 0], sample_vertices[:, 2], alpha=0.6, s=1)
-        for wp in hardpoints['weapons']:
-            pos = wp['position']
-            ax2.scatter([pos[0]], [pos[2]], color='red', s=50, marker='^')
-        for ep in hardpoints['engines']:
-            pos = ep['position']
-            ax2.scatter([pos[0]], [pos[2]], color='orange', s=50, marker='o')
-        ax2.set_title('Top View (X-Z)')
-        ax2.set_xlabel('X')
-        ax2.set_ylabel('Z')
-        ax2.grid(True)
-        
-        # Side view (Y-Z plane)
-        ax3 = fig.add_subplot(223)
-        ax3.scatter(sample_vertices[:, 1], sample_vertices[:, 2], alpha=0.6, s=1)
-        for wp in hardpoints['weapons']:
-            pos = wp['position']
-            ax3.scatter([pos[1]], [pos[2]], color='red', s=50, marker='^')
-        for ep in hardpoints['engines']:
-            pos = ep['position']
-            ax3.scatter([pos[1]], [pos[2]], color='orange', s=50, marker='o')
-        ax3.set_title('Side View (Y-Z)')
-        ax3.set_xlabel('Y')
-        ax3.set_ylabel('Z')
-        ax3.grid(True)
+        # Orthographic views: (subplot, horizontal axis, vertical axis, title)
+        views = [
+            (222, 0, 2, 'Top View (X-Z)'),
+            (223, 1, 2, 'Side View (Y-Z)'),
+            (224, 0, 1, 'Front View (X-Y)'),
+        ]
         
-        # Front view (X-Y plane)
-        ax4 = fig.add_subplot(224)
-        ax4.scatter(sample_vertices[:, 0], sample_vertices[:, 1], alpha=0.6, s=1)
-        for wp in hardpoints['weapons']:
-            pos = wp['position']
-            ax4.scatter([pos[0]], [pos[1]], color='red', s=50, marker='^')
-        for ep in hardpoints['engines']:
-            pos = ep['position']
-            ax4.scatter([pos[0]], [pos[1]], color='orange', s=50, marker='o')
-        ax4.set_title('Front View (X-Y)')
-        ax4.set_xlabel('X')
-        ax4.set_ylabel('Y')
-        ax4.grid(True)
+        for subplot, h, v, title in views:
+            ax = fig.add_subplot(subplot)
+            ax.plot(sample_axes[h], sample_axes[v], ',', alpha=0.6)
+            ax.scatter(weapon_positions[:, h], weapon_positions[:, v], color='red', s=50, marker='^')
+            ax.scatter(engine_positions[:, h], engine_positions[:, v], color='orange', s=50, marker='o')
+            ax.set_title(title)
+            ax.set_xlabel('XYZ'[h])
+            ax.set_ylabel('XYZ'[v])
+            ax.grid(True)
         
-        plt.tight_layout()
-        plt.savefig(f'{model_name}_analysis.png', dpi=150, bbox_inches='tight')
+        fig.savefig(f'{model_name}_analysis.png', dpi=150, bbox_inches='tight')
         print(f"\nVisualization saved as {model_name}_analysis.png")
         
     except Exception as e:
@@ -296,14 +347,16 @@ def main():
         }
     ]
     
+    # Volume and surface area need a fused Trimesh; only build it with --volume
+    need_volume = '--volume' in sys.argv
+    
     for model in models:
         if os.path.exists(model['path']):
-            analysis = analyze_model_geometry(model['path'], model['name'])
+            analysis = analyze_model_geometry(model['path'], model['name'], need_volume)
             if analysis:
                 generate_accurate_config(analysis, model['name'])
         else:
             print(f"File not found: {model['path']}")
 
 if __name__ == "__main__":
-    import os
     main() 
\ No newline at end of file
@@ -4,10 +4,14 @@ Debug Script: Ship Scaling Analysis
 Shows exactly how scaling is applied to all ship components
 """
 
+import numpy as np
+
 def analyze_ship_scaling():
-    print("=" * 60)
-    print("SHIP SCALING ANALYSIS")
-    print("=" * 60)
+    # Collect every line and write the report in one go
+    out = []
+    out.append("=" * 60)
+    out.append("SHIP SCALING ANALYSIS")
+    out.append("=" * 60)
     
     # Ship configurations
     ships = {
@@ -42,47 +46,48 @@ def analyze_ship_scaling():
     }
     
     for ship_name, config in ships.items():
-        print(f"\n{ship_name}:")
-        print(f"  Native dimensions: {config['native_width']:.1f} x {config['native_height']:.1f} x {config['native_length']:.1f}")
+        out.append(f"\n{ship_name}:")
+        out.append(f"  Native dimensions: {config['native_width']:.1f} x {config['native_height']:.1f} x {config['native_length']:.1f}")
         
         # Calculate model scale
         model_scale = config['desired_length'] / config['native_length']
-        print(f"  Model scale: {config['desired_length']} / {config['native_length']:.3f} = {model_scale:.4f}")
+        out.append(f"  Model scale: {config['desired_length']} / {config['native_length']:.3f} = {model_scale:.4f}")
         
         # Calculate final scaled dimensions
         final_width = config['native_width'] * model_scale
         final_height = config['native_height'] * model_scale
         final_length = config['native_length'] * model_scale
-        print(f"  Final dimensions: {final_width:.1f} x {final_height:.1f} x {final_length:.1f} meters")
+        out.append(f"  Final dimensions: {final_width:.1f} x {final_height:.1f} x {final_length:.1f} meters")
         
         # Analyze weapon hardpoints
-        print(f"  Weapon hardpoints (scaled):")
-        for i, weapon in enumerate(config['weapon_hardpoints']):
-            scaled_x = weapon['x'] * model_scale
-            scaled_y = weapon['y'] * model_scale
-            scaled_z = weapon['z'] * model_scale
-            print(f"    {i+1}. {weapon['type']}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f})")
+        # Scale all hardpoints of a kind with one (N, 3) array multiply
+        weapons = config['weapon_hardpoints']
+        scaled_weapons = np.array([[w['x'], w['y'], w['z']] for w in weapons]) * model_scale
+        out.append(f"  Weapon hardpoints (scaled):")
+        for i, (weapon, (scaled_x, scaled_y, scaled_z)) in enumerate(zip(weapons, scaled_weapons)):
+            out.append(f"    {i+1}. {weapon['type']}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f})")
         
         # Analyze engine positions
-        print(f"  Engine positions (scaled):")
-        for i, engine in enumerate(config['engine_positions']):
-            scaled_x = engine['x'] * model_scale
-            scaled_y = engine['y'] * model_scale
-            scaled_z = engine['z'] * model_scale
-            effect_scale = engine['scale'] * model_scale * 5  # Estimate effect scale
-            print(f"    {i+1}. {engine['type']}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) effect_scale: {effect_scale:.3f}")
+        engines = config['engine_positions']
+        scaled_engines = np.array([[e['x'], e['y'], e['z']] for e in engines]) * model_scale
+        effect_scales = np.array([e['scale'] for e in engines]) * model_scale * 5  # Estimate effect scale
+        out.append(f"  Engine positions (scaled):")
+        for i, (engine, (scaled_x, scaled_y, scaled_z), effect_scale) in enumerate(zip(engines, scaled_engines, effect_scales)):
+            out.append(f"    {i+1}. {engine['type']}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) effect_scale: {effect_scale:.3f}")
         
         # Hit detection analysis
         hit_radius = config['desired_length'] * 0.5
-        print(f"  Hit detection radius: {hit_radius:.1f} meters")
+        out.append(f"  Hit detection radius: {hit_radius:.1f} meters")
         
         # Camera positioning
         if ship_name == 'Starship_Calypso':
             cam_y = final_height * 2.0
             cam_z = final_length * 3.0
-            print(f"  Camera position (estimated): Y={cam_y:.1f}, Z={cam_z:.1f}")
+            out.append(f"  Camera position (estimated): Y={cam_y:.1f}, Z={cam_z:.1f}")
         
-        print()
+        out.append("")
+    
+    print("\n".join(out))
 
 def show_effect_scaling_requirements():
     print("=" * 60)
@@ -6,40 +6,108 @@ from NASA sources and other public repositories.
 """
 
 import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
-import time
 
 # Create textures directory if it doesn't exist
 TEXTURE_DIR = 'textures'
 if not os.path.exists(TEXTURE_DIR):
     os.makedirs(TEXTURE_DIR)
 
+# Parallel downloads share one session for keep-alive; each host gets at most MAX_PER_HOST at once
+MAX_WORKERS = 6
+MAX_PER_HOST = 3
+
+session = requests.Session()
+adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+session.mount('http://', adapter)
+session.mount('https://', adapter)
+
+host_limits = {}
+host_limits_lock = threading.Lock()
+
+def host_limit(url):
+    """Semaphore limiting concurrent requests to the host serving url"""
+    host = urlparse(url).netloc
+    with host_limits_lock:
+        if host not in host_limits:
+            host_limits[host] = threading.BoundedSemaphore(MAX_PER_HOST)
+        return host_limits[host]
+
+def read_stamp(stamp_path):
+    """Last-Modified header recorded when a download was started, or None"""
+    try:
+        with open(stamp_path) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
 # Function to download a file with progress bar
 def download_file(url, filename):
     filepath = os.path.join(TEXTURE_DIR, filename)
-    if os.path.exists(filepath):
-        print(f"File {filename} already exists. Skipping.")
-        return
+    stamp_path = filepath + '.last-modified'
     
     try:
-        print(f"Attempting to download {filename} from {url}...")
-        response = requests.get(url, stream=True, timeout=30) # Added timeout
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        
-        total_size = int(response.headers.get('content-length', 0))
-        
-        # Use tqdm for progress bar
-        with open(filepath, 'wb') as file, tqdm(
-            desc=filename,
-            total=total_size,
-            unit='B',
-            unit_scale=True,
-            unit_divisor=1024,
-        ) as bar:
-            for chunk in response.iter_content(chunk_size=8192): # Increased chunk size
-                size = file.write(chunk)
-                bar.update(size)
+        with host_limit(url):
+            # Compare the local copy against the remote one before fetching anything
+            head = session.head(url, allow_redirects=True, timeout=10)
+            remote_size = int(head.headers.get('content-length', 0)) if head.ok else 0
+            last_modified = head.headers.get('last-modified') if head.ok else None
+            local_size = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+            stamp = read_stamp(stamp_path)
+            
+            offset = 0
+            if local_size:
+                if not remote_size:
+                    print(f"File {filename} already exists. Skipping.")
+                    return
+                if stamp and last_modified and stamp != last_modified:
+                    print(f"File {filename} changed on the server. Re-downloading.")
+                elif local_size == remote_size:
+                    if last_modified and not stamp:
+                        with open(stamp_path, 'w') as f:
+                            f.write(last_modified)
+                    print(f"File {filename} is up to date. Skipping.")
+                    return
+                elif local_size < remote_size and stamp and head.headers.get('accept-ranges') == 'bytes':
+                    # Partial download of the same version - fetch only the missing tail
+                    offset = local_size
+            
+            # Record which remote version this file is so an interrupted download can resume safely
+            if last_modified:
+                with open(stamp_path, 'w') as f:
+                    f.write(last_modified)
+            
+            if offset:
+                print(f"Resuming {filename} from byte {offset}...")
+            else:
+                print(f"Attempting to download {filename} from {url}...")
+            headers = {'Range': f'bytes={offset}-'} if offset else {}
+            response = session.get(url, headers=headers, stream=True, timeout=30) # Added timeout
+            response.raise_for_status()  # Raise an exception for HTTP errors
+            
+            if offset and response.status_code != 206:
+                # Server ignored the range request and is sending the whole file
+                offset = 0
+            
+            response.raw.decode_content = True  # Undo any gzip/deflate transfer encoding while streaming
+            
+            total_size = offset + int(response.headers.get('content-length', 0))
+            
+            # Copy straight from the socket to disk in 1MB blocks; tqdm wraps raw.read for the progress bar
+            with open(filepath, 'ab' if offset else 'wb') as file, tqdm.wrapattr(
+                response.raw,
+                'read',
+                total=total_size,
+                initial=offset,
+                desc=filename,
+            ) as raw:
+                shutil.copyfileobj(raw, file, length=1024 * 1024)
         
         print(f"Downloaded {filename} successfully.")
         
@@ -100,12 +168,10 @@ textures_to_download = [
     # ... and so on for other fictional dwarf planets ...
 ]
 
-# Download each texture file
+# Download texture files in parallel (per-host limits keep this polite to the servers)
 print("Downloading texture files...")
-for url, filename in textures_to_download:
-    download_file(url, filename)
-    # Add a short delay between requests to be nice to the servers
-    time.sleep(1) # Increased delay to 1 second
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    list(executor.map(lambda item: download_file(*item), textures_to_download))
 
 print("\nAll specified texture files attempted to download.")
 print("Please ensure you have the necessary Python packages: pip install requests tqdm")
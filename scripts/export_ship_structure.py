@@ -4,45 +4,112 @@ Export Ship Structure
 Exports ships to OBJ format and analyzes actual mesh structure
 """
 
+import sys
 import trimesh
 import numpy as np
+from model_pool import run_per_model
+from jit import njit
 
-def export_and_analyze_ship(file_path, model_name):
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+def euclidean_clusters(points, radius, min_size):
+    """Label points connected through neighbours within radius; clusters under min_size get -1"""
+    tree = cKDTree(points)
+    pairs = tree.query_pairs(r=radius, output_type='ndarray')
+    graph = coo_matrix((np.ones(len(pairs), dtype=bool), (pairs[:, 0], pairs[:, 1])),
+                       shape=(len(points), len(points)))
+    _, components = connected_components(graph, directed=False)
+    
+    # Drop small components and renumber the rest 0..n-1 (component ids follow first appearance)
+    keep = np.bincount(components)[components] >= min_size
+    labels = np.full(len(points), -1)
+    labels[keep] = np.searchsorted(np.unique(components[keep]), components[keep])
+    return labels
+
+@njit(cache=True)
+def _feature_sums(v, aft_threshold, left_x, right_x, centroid_z, top_y):
+    """Single pass summing left wing, right wing and bridge-top vertices"""
+    sums = np.zeros((3, 3))
+    counts = np.zeros(3, dtype=np.int64)
+    for i in range(v.shape[0]):
+        x, y, z = v[i, 0], v[i, 1], v[i, 2]
+        in_aft = z > aft_threshold
+        in_top = abs(z - centroid_z) < 20 and y > top_y
+        if not in_aft and not in_top:
+            continue
+        if in_aft:
+            if x < left_x:
+                region = 0
+            elif x > right_x:
+                region = 1
+            else:
+                region = -1
+            if region >= 0:
+                counts[region] += 1
+                sums[region, 0] += x
+                sums[region, 1] += y
+                sums[region, 2] += z
+        if in_top:
+            counts[2] += 1
+            sums[2, 0] += x
+            sums[2, 1] += y
+            sums[2, 2] += z
+    return sums, counts
+
+def extreme_region_center(vertices, tree, index, radius, mask=None):
+    """Mean of the vertices (only those in mask, if given) within radius of the extreme vertex at index"""
+    point = vertices[index]
+    if tree is not None:
+        near = np.asarray(tree.query_ball_point(point, r=radius), dtype=np.intp)
+        if mask is not None:
+            near = near[mask[near]]
+        return vertices[near].mean(axis=0)
+    near = np.einsum('ij,ij->i', vertices - point, vertices - point) <= radius * radius
+    if mask is not None:
+        near &= mask
+    return vertices[near].mean(axis=0)
+
+def export_and_analyze_ship(file_path, model_name, compute_hull=False, compute_topology=False):
     """Export ship to OBJ and analyze its actual structure"""
     print(f"\n{'='*60}")
     print(f"ANALYZING SHIP STRUCTURE: {model_name}")
     print(f"{'='*60}")
     
-    # Load the model
-    scene = trimesh.load(file_path)
-    
-    if isinstance(scene, trimesh.Scene):
-        mesh = scene.dump(concatenate=True)
-    else:
-        mesh = scene
+    # Load the model, concatenating scene geometry during the load
+    mesh = trimesh.load(file_path, force='mesh')
     
-    # Export to OBJ for external viewing
+    # Export to OBJ for external viewing; 4 decimals is plenty for a viewer and keeps float formatting cheap
     obj_path = f'{model_name}.obj'
-    mesh.export(obj_path)
+    mesh.export(obj_path, file_type='obj', digits=4)
     print(f"Exported to {obj_path}")
     
+    # Read bounds/centroid once; everything below reuses these arrays
+    bounds = np.asarray(mesh.bounds)
+    dimensions = bounds[1] - bounds[0]
+    centroid = mesh.centroid
+    
     # Analyze mesh structure
     print(f"\nMesh statistics:")
     print(f"  Vertices: {len(mesh.vertices)}")
     print(f"  Faces: {len(mesh.faces)}")
-    print(f"  Is watertight: {mesh.is_watertight}")
-    print(f"  Volume: {mesh.volume:.2f}")
+    if compute_topology:
+        print(f"  Is watertight: {mesh.is_watertight}")
+        print(f"  Volume: {mesh.volume:.2f}")
     
-    bounds = mesh.bounds
-    dimensions = bounds[1] - bounds[0]
     print(f"\nDimensions:")
     print(f"  X: {dimensions[0]:.2f} ({bounds[0][0]:.2f} to {bounds[1][0]:.2f})")
     print(f"  Y: {dimensions[1]:.2f} ({bounds[0][1]:.2f} to {bounds[1][1]:.2f})")
     print(f"  Z: {dimensions[2]:.2f} ({bounds[0][2]:.2f} to {bounds[1][2]:.2f})")
     
-    # Find convex hull to understand overall shape
-    hull = mesh.convex_hull
-    print(f"\nConvex hull vertices: {len(hull.vertices)}")
+    # Find convex hull to understand overall shape (a full Qhull run, so only on request)
+    if compute_hull:
+        hull = mesh.convex_hull
+        print(f"\nConvex hull vertices: {len(hull.vertices)}")
     
     # Analyze mesh connectivity to find distinct parts
     components = mesh.split(only_watertight=False)
@@ -61,11 +128,11 @@ def export_and_analyze_ship(file_path, model_name):
     
     # Based on your description, let's look for specific features
     if model_name == "Starship_Calypso":
-        analyze_calypso_features(mesh)
+        analyze_calypso_features(mesh, bounds, centroid)
     
     return mesh
 
-def analyze_calypso_features(mesh):
+def analyze_calypso_features(mesh, bounds, centroid):
     """Analyze Calypso specific features based on description"""
     print("\nAnalyzing Calypso features...")
     print("Description: Long, broadly symmetrical ship with:")
@@ -74,69 +141,100 @@ def analyze_calypso_features(mesh):
     print("  - Several large engine exhausts at rear")
     print("  - Weapons under winglet protrusions")
     
-    vertices = mesh.vertices
-    bounds = mesh.bounds
+    vertices = np.asarray(mesh.vertices)
+    # Threshold inputs as plain Python floats, computed once
+    z_min, z_max = bounds[:, 2].tolist()
+    z_span = z_max - z_min
+    centroid_z = float(centroid[2])
     
     # Assuming Z is the front-to-back axis (based on previous analysis)
     # AFT = rear = positive Z
     
-    # Find AFT section (rear 30%)
-    aft_threshold = bounds[0][2] + (bounds[1][2] - bounds[0][2]) * 0.7
-    aft_vertices = vertices[vertices[:, 2] > aft_threshold]
+    # Build the AFT, rear and mid-section masks together from one read of the Z column
+    z = vertices[:, 2]
+    aft_threshold = z_min + z_span * 0.7  # rear 30%
+    rear_threshold = z_max - z_span * 0.05
+    aft_mask = z > aft_threshold
+    rear_mask = z > rear_threshold
+    mid_mask = np.abs(z - centroid_z) < 20
+    
+    # Wing tips are the lateral extremes of the AFT section (20th/80th order statistics via one introselect)
+    # and the bridge tower is the top 10% of the mid-section by Y; NaN thresholds select nothing
+    aft_x = vertices[aft_mask, 0]
+    p20 = p80 = np.nan
+    if len(aft_x) > 0:
+        k20, k80 = int(0.2 * len(aft_x)), int(0.8 * len(aft_x))
+        p20, p80 = np.partition(aft_x, [k20, k80])[[k20, k80]]
+    mid_y = vertices[mid_mask, 1]
+    p90 = np.nan
+    if len(mid_y) > 0:
+        k90 = int(0.9 * len(mid_y))
+        p90 = np.partition(mid_y, k90)[k90]
+    
+    # Accumulate all three feature centres in one compiled pass
+    sums, counts = _feature_sums(vertices, aft_threshold, p20, p80, centroid_z, p90)
+    
+    # Absolute extremes (nose, rearmost point, wing tips) come from argmin/argmax and are
+    # averaged over a small ball around the extreme vertex rather than a percentile band
+    tree = cKDTree(vertices) if cKDTree is not None else None
+    ball_radius = z_span * 0.05
     
     print(f"\nAFT section analysis (Z > {aft_threshold:.1f}):")
-    print(f"  Vertices: {len(aft_vertices)}")
+    print(f"  Vertices: {len(aft_x)}")
     
-    if len(aft_vertices) > 0:
-        # Look for wing protrusions by finding lateral extremes
-        left_wing = aft_vertices[aft_vertices[:, 0] < np.percentile(aft_vertices[:, 0], 20)]
-        right_wing = aft_vertices[aft_vertices[:, 0] > np.percentile(aft_vertices[:, 0], 80)]
-        
-        if len(left_wing) > 0:
-            left_wing_center = np.mean(left_wing, axis=0)
+    if len(aft_x) > 0:
+        if counts[0] > 0:
+            left_wing_center = sums[0] / counts[0]
             print(f"  Left wing area center: [{left_wing_center[0]:.1f}, {left_wing_center[1]:.1f}, {left_wing_center[2]:.1f}]")
-            
-            # Weapon should be just under this
-            left_weapon = left_wing_center.copy()
-            left_weapon[1] -= 5  # Just below
-            print(f"  Left weapon position: [{left_weapon[0]:.1f}, {left_weapon[1]:.1f}, {left_weapon[2]:.1f}]")
         
-        if len(right_wing) > 0:
-            right_wing_center = np.mean(right_wing, axis=0)
+        if counts[1] > 0:
+            right_wing_center = sums[1] / counts[1]
             print(f"  Right wing area center: [{right_wing_center[0]:.1f}, {right_wing_center[1]:.1f}, {right_wing_center[2]:.1f}]")
-            
-            # Weapon should be just under this
-            right_weapon = right_wing_center.copy()
-            right_weapon[1] -= 5  # Just below
-            print(f"  Right weapon position: [{right_weapon[0]:.1f}, {right_weapon[1]:.1f}, {right_weapon[2]:.1f}]")
+        
+        # Weapons sit at the actual wing tips: the AFT vertices with extreme X, averaged over AFT vertices only
+        aft_indices = np.flatnonzero(aft_mask)
+        left_weapon = extreme_region_center(vertices, tree, aft_indices[np.argmin(aft_x)], ball_radius, aft_mask)
+        right_weapon = extreme_region_center(vertices, tree, aft_indices[np.argmax(aft_x)], ball_radius, aft_mask)
+        print(f"  Left weapon position (wing tip): [{left_weapon[0]:.1f}, {left_weapon[1]:.1f}, {left_weapon[2]:.1f}]")
+        print(f"  Right weapon position (wing tip): [{right_weapon[0]:.1f}, {right_weapon[1]:.1f}, {right_weapon[2]:.1f}]")
     
     # Find engine exhausts at the very rear
-    rear_threshold = bounds[1][2] - (bounds[1][2] - bounds[0][2]) * 0.05
-    rear_vertices = vertices[vertices[:, 2] > rear_threshold]
+    rear_vertices = vertices[rear_mask]
     
     print(f"\nEngine exhaust analysis (Z > {rear_threshold:.1f}):")
     print(f"  Vertices at rear: {len(rear_vertices)}")
     
+    # Main engine at the absolute rearmost point, nose at the absolute front
+    main_engine = extreme_region_center(vertices, tree, np.argmax(z), ball_radius)
+    nose = extreme_region_center(vertices, tree, np.argmin(z), ball_radius)
+    print(f"  Main engine (rearmost point): [{main_engine[0]:.1f}, {main_engine[1]:.1f}, {main_engine[2]:.1f}]")
+    print(f"  Nose (frontmost point): [{nose[0]:.1f}, {nose[1]:.1f}, {nose[2]:.1f}]")
+    
     if len(rear_vertices) > 100:
-        # Use DBSCAN to find engine clusters
-        from sklearn.cluster import DBSCAN
-        clustering = DBSCAN(eps=10, min_samples=20).fit(rear_vertices)
-        n_engines = len(set(clustering.labels_)) - (1 if -1 in clustering.labels_ else 0)
+        # Secondary engines: cluster rear vertices with KD-tree region queries (DBSCAN only if scipy is missing)
+        if cKDTree is not None:
+            labels = euclidean_clusters(rear_vertices, radius=10, min_size=20)
+        else:
+            # sklearn is heavy to import, so only touch it on this fallback path
+            try:
+                from sklearn.cluster import DBSCAN
+            except ImportError:
+                raise ImportError("Engine clustering needs scipy (preferred) or scikit-learn: "
+                                  "uv pip install scipy") from None
+            labels = DBSCAN(eps=10, min_samples=20).fit(rear_vertices).labels_
+        n_engines = len(set(labels)) - (1 if -1 in labels else 0)
         
         print(f"  Found {n_engines} potential engine exhausts")
         
         for i in range(n_engines):
-            engine_verts = rear_vertices[clustering.labels_ == i]
+            engine_verts = rear_vertices[labels == i]
             engine_center = np.mean(engine_verts, axis=0)
             print(f"  Engine {i+1}: [{engine_center[0]:.1f}, {engine_center[1]:.1f}, {engine_center[2]:.1f}]")
     
-    # Look for bridge tower (highest Y points in middle section)
-    mid_section = vertices[np.abs(vertices[:, 2] - mesh.centroid[2]) < 20]
-    if len(mid_section) > 0:
-        top_verts = mid_section[mid_section[:, 1] > np.percentile(mid_section[:, 1], 90)]
-        if len(top_verts) > 0:
-            bridge_center = np.mean(top_verts, axis=0)
-            print(f"\nBridge tower location: [{bridge_center[0]:.1f}, {bridge_center[1]:.1f}, {bridge_center[2]:.1f}]")
+    # Bridge tower (highest Y points in middle section)
+    if counts[2] > 0:
+        bridge_center = sums[2] / counts[2]
+        print(f"\nBridge tower location: [{bridge_center[0]:.1f}, {bridge_center[1]:.1f}, {bridge_center[2]:.1f}]")
 
 def create_corrected_config(model_name):
     """Generate corrected configuration based on actual structure"""
@@ -157,6 +255,11 @@ def create_corrected_config(model_name):
 }
         """)
 
+def export_and_report(model, compute_hull=False, compute_topology=False):
+    """Run the export and config report for one ship"""
+    export_and_analyze_ship(model['path'], model['name'], compute_hull, compute_topology)
+    create_corrected_config(model['name'])
+
 def main():
     """Export and analyze ship models"""
     models = [
@@ -170,22 +273,12 @@ def main():
         }
     ]
     
-    for model in models:
-        if os.path.exists(model['path']):
-            mesh = export_and_analyze_ship(model['path'], model['name'])
-            create_corrected_config(model['name'])
-        else:
-            print(f"File not found: {model['path']}")
+    # The convex hull, watertightness and volume are only printed for information;
+    # compute them with --hull / --topology
+    compute_hull = '--hull' in sys.argv
+    compute_topology = '--topology' in sys.argv
+    
+    run_per_model(export_and_report, models, compute_hull, compute_topology)
 
 if __name__ == "__main__":
-    import os
-    
-    # Check for sklearn
-    try:
-        from sklearn.cluster import DBSCAN
-    except ImportError:
-        print("Installing scikit-learn...")
-        import subprocess
-        subprocess.run(["uv", "pip", "install", "scikit-learn"])
-    
     main() 
\ No newline at end of file
@@ -4,10 +4,13 @@ Final Intelligent Verification
 Shows the exact final scaled positions from intelligent hardpoint analysis
 """
 
+import numpy as np
+
 def verify_intelligent_scaling():
-    print("=" * 70)
-    print("FINAL VERIFICATION - INTELLIGENT HARDPOINT ANALYSIS")
-    print("=" * 70)
+    out = []
+    out.append("=" * 70)
+    out.append("FINAL VERIFICATION - INTELLIGENT HARDPOINT ANALYSIS")
+    out.append("=" * 70)
     
     # INTELLIGENT configurations based on actual structure analysis
     ships = {
@@ -16,69 +19,73 @@ def verify_intelligent_scaling():
             'desired_length': 20,
             'native_centroid': [32.98, -13.83, -0.22],
             'asymmetry_ratio': 1.69,  # Highly asymmetrical design
-            'weapon_hardpoints': [
-                {'x': -59.8, 'y': 2.4, 'z': -35.1, 'type': 'left_wing_tip'},
-                {'x': 118.2, 'y': -9.7, 'z': -42.3, 'type': 'right_wing_tip'},
-            ],
-            'engine_positions': [
-                {'x': 35.6, 'y': -20.4, 'z': 71.2, 'scale': 1.0, 'type': 'main_absolute_rear'},
-                {'x': 7.7, 'y': -15.7, 'z': 51.4, 'scale': 0.6, 'type': 'left_wing_engine'},
-                {'x': 78.1, 'y': -17.4, 'z': 53.4, 'scale': 0.6, 'type': 'right_wing_engine'},
-            ]
+            'weapon_pos': np.array([
+                [-59.8, 2.4, -35.1],
+                [118.2, -9.7, -42.3],
+            ]),
+            'weapon_types': ['left_wing_tip', 'right_wing_tip'],
+            'engine_pos': np.array([
+                [35.6, -20.4, 71.2],
+                [7.7, -15.7, 51.4],
+                [78.1, -17.4, 53.4],
+            ]),
+            'engine_scales': np.array([1.0, 0.6, 0.6]),
+            'engine_types': ['main_absolute_rear', 'left_wing_engine', 'right_wing_engine'],
         },
         'Sky_Predator': {
             'native_length': 1.99,
             'desired_length': 8,
             'native_centroid': [0.28, 0.00, -0.01],
             'asymmetry_ratio': 1.0,  # Symmetric design
-            'weapon_hardpoints': [
-                {'x': 0.91, 'y': -0.03, 'z': -0.99, 'type': 'nose_absolute_front'},
-            ],
-            'engine_positions': [
-                {'x': 0.92, 'y': -0.03, 'z': 1.00, 'scale': 1.0, 'type': 'tail_absolute_rear'},
-            ]
+            'weapon_pos': np.array([
+                [0.91, -0.03, -0.99],
+            ]),
+            'weapon_types': ['nose_absolute_front'],
+            'engine_pos': np.array([
+                [0.92, -0.03, 1.00],
+            ]),
+            'engine_scales': np.array([1.0]),
+            'engine_types': ['tail_absolute_rear'],
         }
     }
     
     for ship_name, config in ships.items():
-        print(f"\n{ship_name}:")
+        out.append(f"\n{ship_name}:")
         
         # Calculate model scale
         model_scale = config['desired_length'] / config['native_length']
-        print(f"  Model scale: {config['desired_length']} / {config['native_length']:.2f} = {model_scale:.4f}")
+        out.append(f"  Model scale: {config['desired_length']} / {config['native_length']:.2f} = {model_scale:.4f}")
         
         # Final ship dimensions
         final_length = config['native_length'] * model_scale
-        print(f"  Final length: {final_length:.1f} meters")
-        print(f"  Ship asymmetry: {config['asymmetry_ratio']:.2f} (1.0 = symmetric)")
+        out.append(f"  Final length: {final_length:.1f} meters")
+        out.append(f"  Ship asymmetry: {config['asymmetry_ratio']:.2f} (1.0 = symmetric)")
         
         # Show centroid offset impact
         centroid = config['native_centroid']
-        scaled_centroid = [c * model_scale for c in centroid]
-        print(f"  Scaled centroid offset: [{scaled_centroid[0]:.2f}, {scaled_centroid[1]:.2f}, {scaled_centroid[2]:.2f}] meters")
+        scaled_centroid = np.asarray(centroid) * model_scale
+        out.append(f"  Scaled centroid offset: [{scaled_centroid[0]:.2f}, {scaled_centroid[1]:.2f}, {scaled_centroid[2]:.2f}] meters")
         
         # Weapon hardpoints in final scale
-        print(f"  Weapon hardpoints (final scale):")
-        for weapon in config['weapon_hardpoints']:
-            scaled_x = weapon['x'] * model_scale
-            scaled_y = weapon['y'] * model_scale
-            scaled_z = weapon['z'] * model_scale
-            print(f"    {weapon['type']}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) meters")
+        out.append(f"  Weapon hardpoints (final scale):")
+        scaled_weapons = config['weapon_pos'] * model_scale
+        for name, (scaled_x, scaled_y, scaled_z) in zip(config['weapon_types'], scaled_weapons):
+            out.append(f"    {name}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) meters")
         
         # Engine positions in final scale
-        print(f"  Engine positions (final scale):")
-        for engine in config['engine_positions']:
-            scaled_x = engine['x'] * model_scale
-            scaled_y = engine['y'] * model_scale
-            scaled_z = engine['z'] * model_scale
-            effect_scale = engine['scale'] * model_scale * 0.3  # Very conservative effect scaling
-            print(f"    {engine['type']}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) effect: {effect_scale:.3f}")
+        out.append(f"  Engine positions (final scale):")
+        scaled_engines = config['engine_pos'] * model_scale
+        effect_scales = config['engine_scales'] * model_scale * 0.3  # Very conservative effect scaling
+        for name, (scaled_x, scaled_y, scaled_z), effect_scale in zip(config['engine_types'], scaled_engines, effect_scales):
+            out.append(f"    {name}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) effect: {effect_scale:.3f}")
         
         # Hit detection
         hit_radius = config['desired_length'] * 0.35  # Conservative hit radius
-        print(f"  Hit detection radius: {hit_radius:.1f} meters")
+        out.append(f"  Hit detection radius: {hit_radius:.1f} meters")
         
-        print()
+        out.append("")
+    
+    print("\n".join(out))
 
 def show_intelligent_improvements():
     print("=" * 70)
@@ -4,10 +4,13 @@ Final Scaling Verification
 Shows the corrected hardpoint positions based on actual geometry
 """
 
+import numpy as np
+
 def verify_final_scaling():
-    print("=" * 70)
-    print("FINAL SCALING VERIFICATION - GEOMETRY-BASED POSITIONS")
-    print("=" * 70)
+    out = []
+    out.append("=" * 70)
+    out.append("FINAL SCALING VERIFICATION - GEOMETRY-BASED POSITIONS")
+    out.append("=" * 70)
     
     # Updated ship configurations based on actual geometry analysis
     ships = {
@@ -15,35 +18,41 @@ def verify_final_scaling():
             'native_length': 142.672,
             'desired_length': 20,
             'native_centroid': [32.984, -13.834, -0.218],
-            'weapon_hardpoints': [
-                {'x': 55.0, 'y': -3.8, 'z': -46.4, 'type': 'cannon'},
-                {'x': -20.3, 'y': -1.6, 'z': -49.9, 'type': 'cannon'},
-            ],
-            'engine_positions': [
-                {'x': 18.0, 'y': -1.9, 'z': 48.6, 'scale': 1.0, 'type': 'main'},
-                {'x': 54.4, 'y': -1.7, 'z': 47.1, 'scale': 0.7, 'type': 'secondary'},
-                {'x': -23.5, 'y': -1.7, 'z': 49.1, 'scale': 0.7, 'type': 'secondary'},
-            ]
+            'weapon_pos': np.array([
+                [55.0, -3.8, -46.4],
+                [-20.3, -1.6, -49.9],
+            ]),
+            'weapon_types': ['cannon', 'cannon'],
+            'engine_pos': np.array([
+                [18.0, -1.9, 48.6],
+                [54.4, -1.7, 47.1],
+                [-23.5, -1.7, 49.1],
+            ]),
+            'engine_scales': np.array([1.0, 0.7, 0.7]),
+            'engine_types': ['main', 'secondary', 'secondary'],
         },
         'Sky_Predator': {
             'native_length': 1.983,
             'desired_length': 8,
             'native_centroid': [0.279, 0.001, -0.011],
-            'weapon_hardpoints': [
-                {'x': 0.3, 'y': 0.0, 'z': -0.5, 'type': 'cannon'},
-            ],
-            'engine_positions': [
-                {'x': 0.3, 'y': 0.0, 'z': 0.6, 'scale': 1.0, 'type': 'main'},
-            ]
+            'weapon_pos': np.array([
+                [0.3, 0.0, -0.5],
+            ]),
+            'weapon_types': ['cannon'],
+            'engine_pos': np.array([
+                [0.3, 0.0, 0.6],
+            ]),
+            'engine_scales': np.array([1.0]),
+            'engine_types': ['main'],
         }
     }
     
     for ship_name, config in ships.items():
-        print(f"\n{ship_name}:")
+        out.append(f"\n{ship_name}:")
         
         # Calculate model scale
         model_scale = config['desired_length'] / config['native_length']
-        print(f"  Model scale: {config['desired_length']} / {config['native_length']:.3f} = {model_scale:.4f}")
+        out.append(f"  Model scale: {config['desired_length']} / {config['native_length']:.3f} = {model_scale:.4f}")
         
         # Final ship dimensions
         if ship_name == 'Starship_Calypso':
@@ -54,35 +63,34 @@ def verify_final_scaling():
             final_height = 1.1 * model_scale
             
         final_length = config['native_length'] * model_scale
-        print(f"  Final dimensions: {final_width:.1f} x {final_height:.1f} x {final_length:.1f} meters")
+        out.append(f"  Final dimensions: {final_width:.1f} x {final_height:.1f} x {final_length:.1f} meters")
         
         # Show centroid offset (important for positioning)
-        centroid = config['native_centroid']
-        print(f"  Native centroid: [{centroid[0]:.1f}, {centroid[1]:.1f}, {centroid[2]:.1f}]")
-        print(f"  Scaled centroid offset: [{centroid[0]*model_scale:.2f}, {centroid[1]*model_scale:.2f}, {centroid[2]*model_scale:.2f}]")
+        centroid = np.asarray(config['native_centroid'])
+        scaled_centroid = centroid * model_scale
+        out.append(f"  Native centroid: [{centroid[0]:.1f}, {centroid[1]:.1f}, {centroid[2]:.1f}]")
+        out.append(f"  Scaled centroid offset: [{scaled_centroid[0]:.2f}, {scaled_centroid[1]:.2f}, {scaled_centroid[2]:.2f}]")
         
         # Weapon hardpoints in final scale
-        print(f"  Weapon hardpoints (final scale):")
-        for i, weapon in enumerate(config['weapon_hardpoints']):
-            scaled_x = weapon['x'] * model_scale
-            scaled_y = weapon['y'] * model_scale
-            scaled_z = weapon['z'] * model_scale
-            print(f"    {i+1}. {weapon['type']}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) meters")
+        out.append(f"  Weapon hardpoints (final scale):")
+        scaled_weapons = config['weapon_pos'] * model_scale
+        for i, (name, (scaled_x, scaled_y, scaled_z)) in enumerate(zip(config['weapon_types'], scaled_weapons)):
+            out.append(f"    {i+1}. {name}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) meters")
         
         # Engine positions in final scale
-        print(f"  Engine positions (final scale):")
-        for i, engine in enumerate(config['engine_positions']):
-            scaled_x = engine['x'] * model_scale
-            scaled_y = engine['y'] * model_scale
-            scaled_z = engine['z'] * model_scale
-            effect_scale = engine['scale'] * model_scale * 2  # Conservative effect scaling
-            print(f"    {i+1}. {engine['type']}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) effect: {effect_scale:.3f}")
+        out.append(f"  Engine positions (final scale):")
+        scaled_engines = config['engine_pos'] * model_scale
+        effect_scales = config['engine_scales'] * model_scale * 2  # Conservative effect scaling
+        for i, (name, (scaled_x, scaled_y, scaled_z), effect_scale) in enumerate(zip(config['engine_types'], scaled_engines, effect_scales)):
+            out.append(f"    {i+1}. {name}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) effect: {effect_scale:.3f}")
         
         # Hit detection
         hit_radius = config['desired_length'] * 0.5
-        print(f"  Hit detection radius: {hit_radius:.1f} meters")
+        out.append(f"  Hit detection radius: {hit_radius:.1f} meters")
         
-        print()
+        out.append("")
+    
+    print("\n".join(out))
 
 def show_comparison():
     print("=" * 70)
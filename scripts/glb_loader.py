@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+GLB Loader
+Reads triangle geometry straight from a GLB's binary chunk for the analysis scripts
+"""
+
+import json
+import os
+import struct
+from types import SimpleNamespace
+import trimesh
+import numpy as np
+
+# glTF accessor componentType -> dtype for the layouts read directly from the binary chunk
+_COMPONENT_DTYPES = {5121: np.uint8, 5123: np.uint16, 5125: np.uint32, 5126: np.float32}
+
+def node_matrix(node):
+    """Local 4x4 transform of a glTF node (matrix or TRS)"""
+    if 'matrix' in node:
+        return np.array(node['matrix'], dtype=np.float64).reshape(4, 4).T
+    matrix = np.eye(4)
+    if 'scale' in node:
+        matrix = np.diag(list(node['scale']) + [1.0]) @ matrix
+    if 'rotation' in node:
+        x, y, z, w = node['rotation']
+        matrix = trimesh.transformations.quaternion_matrix([w, x, y, z]) @ matrix
+    if 'translation' in node:
+        matrix = trimesh.transformations.translation_matrix(node['translation']) @ matrix
+    return matrix
+
+def _accessor_array(gltf, blob, index, columns):
+    """Zero-copy view of a tightly packed accessor in the binary chunk, or None for other layouts"""
+    accessor = gltf['accessors'][index]
+    if 'bufferView' not in accessor or 'sparse' in accessor or accessor['componentType'] not in _COMPONENT_DTYPES:
+        return None
+    view = gltf['bufferViews'][accessor['bufferView']]
+    dtype = np.dtype(_COMPONENT_DTYPES[accessor['componentType']])
+    if view.get('buffer', 0) != 0 or view.get('byteStride', dtype.itemsize * columns) != dtype.itemsize * columns:
+        return None
+    offset = view.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+    return np.frombuffer(blob, dtype=dtype, count=accessor['count'] * columns, offset=offset).reshape(-1, columns)
+
+def glb_geometry(file_path):
+    """Triangle vertices and faces read straight from a GLB's POSITION and index buffers, or None if it needs a full loader"""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    magic, _, _ = struct.unpack_from('<4sII', data, 0)
+    json_length, json_type = struct.unpack_from('<I4s', data, 12)
+    if magic != b'glTF' or json_type != b'JSON' or len(data) < 28 + json_length:
+        return None
+    gltf = json.loads(data[20:20 + json_length])
+    bin_length, bin_type = struct.unpack_from('<I4s', data, 20 + json_length)
+    if bin_type != b'BIN\0' or gltf.get('extensionsRequired') or not gltf.get('scenes'):
+        return None
+    blob = memoryview(data)[28 + json_length:28 + json_length + bin_length]
+    
+    vertices, faces, count = [], [], 0
+    stack = [(index, np.eye(4)) for index in gltf['scenes'][gltf.get('scene', 0)].get('nodes', [])]
+    while stack:
+        index, parent = stack.pop()
+        node = gltf['nodes'][index]
+        world = parent @ node_matrix(node)
+        if 'mesh' in node:
+            for primitive in gltf['meshes'][node['mesh']]['primitives']:
+                if primitive.get('mode', 4) != 4:
+                    return None
+                positions = _accessor_array(gltf, blob, primitive['attributes']['POSITION'], 3)
+                if positions is None or positions.dtype != np.float32:
+                    return None
+                if 'indices' in primitive:
+                    indices = _accessor_array(gltf, blob, primitive['indices'], 1)
+                    if indices is None or indices.dtype == np.float32:
+                        return None
+                else:
+                    indices = np.arange(len(positions))
+                if not np.array_equal(world, np.eye(4)):
+                    positions = trimesh.transformations.transform_points(positions, world).astype(np.float32)
+                vertices.append(positions)
+                faces.append(indices.reshape(-1, 3).astype(np.int32) + count)
+                count += len(positions)
+        stack.extend((child, world) for child in node.get('children', []))
+    
+    if not vertices:
+        return None
+    return (vertices[0] if len(vertices) == 1 else np.concatenate(vertices)), np.concatenate(faces)
+
+def load_or_cache(file_path):
+    """Vertices, faces, bounds and centroid of a model, cached next to it as .mesh.npz"""
+    cache_path = file_path + '.mesh.npz'
+    
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+        with np.load(cache_path) as cached:
+            mesh = SimpleNamespace(**{key: cached[key] for key in cached.files})
+        print(f"Loaded cached geometry from {cache_path}")
+        return mesh
+    
+    # Only the positions and indices are used, so read them straight from the binary chunk;
+    # anything that reader does not handle goes through trimesh, still skipping materials and processing
+    geometry = glb_geometry(file_path)
+    if geometry is None:
+        loaded = trimesh.load(file_path, process=False, skip_materials=True, force='mesh', merge_primitives=True)
+        geometry = loaded.vertices, loaded.faces
+    positions, faces = geometry
+    
+    # Printed coordinates and plots need far less than float64 precision, so halve the bandwidth of every scan;
+    # bounds come from the float32 vertices so range-based binning never drops an edge vertex
+    vertices = np.ascontiguousarray(positions, dtype=np.float32)
+    
+    # Area-weighted mean of the face centroids (the definition of Trimesh.centroid), in one pass over the faces
+    triangles = np.asarray(positions, dtype=np.float64)[faces]
+    areas = 0.5 * np.linalg.norm(np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]), axis=1)
+    
+    mesh = SimpleNamespace(
+        vertices=vertices,
+        faces=faces.astype(np.int32, copy=False),
+        bounds=np.array([vertices.min(axis=0), vertices.max(axis=0)], dtype=np.float64),
+        centroid=(triangles.mean(axis=1) * areas[:, None]).sum(axis=0) / areas.sum()
+    )
+    
+    try:
+        np.savez(cache_path, **vars(mesh))
+    except OSError as e:
+        print(f"Could not write geometry cache {cache_path}: {e}")
+    
+    return mesh
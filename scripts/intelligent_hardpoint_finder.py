@@ -4,31 +4,57 @@ Intelligent Hardpoint Finder
 Analyzes actual ship structure to find real weapon and engine positions
 """
 
+import os
+from functools import lru_cache
+from types import SimpleNamespace
 import trimesh
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from model_pool import run_per_model
 
-def find_intelligent_hardpoints(file_path, model_name):
+def _scene_meshes(scene):
+    if isinstance(scene, trimesh.Scene):
+        return [mesh for mesh in scene.geometry.values() if isinstance(mesh, trimesh.Trimesh)]
+    return [scene]
+
+def _concat_vertices(meshes):
+    """Stack the vertices of all meshes as float32 without building a combined Trimesh.
+    
+    GLB exports split vertices along normal and UV seams, so coincident copies (to 1e-4) are
+    dropped, keeping the first of each in the original order.
+    """
+    vertices = np.concatenate([mesh.vertices.astype(np.float32, copy=False) for mesh in meshes], axis=0)
+    quantized = np.round(vertices * 1e4).astype(np.int64)
+    _, first = np.unique(quantized, axis=0, return_index=True)
+    return vertices[np.sort(first)]
+
+@lru_cache(maxsize=8)
+def _load_ship(abs_path):
+    meshes = _scene_meshes(trimesh.load(abs_path))
+    vertices = _concat_vertices(meshes)
+    return SimpleNamespace(
+        vertices=vertices,
+        bounds=np.array([vertices.min(axis=0), vertices.max(axis=0)]),
+        # Area-weighted like Trimesh.centroid; float32 so comparisons against it stay in float32
+        centroid=np.average([mesh.centroid for mesh in meshes], axis=0,
+                            weights=[mesh.area for mesh in meshes]).astype(np.float32)
+    )
+
+def load_ship(file_path):
+    """Vertices, bounds and centroid of a GLB, parsing each file only once"""
+    return _load_ship(os.path.abspath(file_path))
+
+def find_intelligent_hardpoints(ship, model_name):
     """Find actual hardpoints by analyzing ship structure intelligently"""
     print(f"\n{'='*60}")
     print(f"INTELLIGENT HARDPOINT ANALYSIS: {model_name}")
     print(f"{'='*60}")
     
-    # Load the model
-    scene = trimesh.load(file_path)
-    
-    if isinstance(scene, trimesh.Scene):
-        meshes = [mesh for mesh in scene.geometry.values() if isinstance(mesh, trimesh.Trimesh)]
-        if len(meshes) > 1:
-            combined = trimesh.util.concatenate(meshes)
-        else:
-            combined = meshes[0]
-    else:
-        combined = scene
-    
-    vertices = combined.vertices
-    bounds = combined.bounds
-    center = combined.centroid
+    vertices = ship.vertices
+    bounds = ship.bounds
+    center = ship.centroid
     
     print(f"Ship bounds: X[{bounds[0][0]:.2f}, {bounds[1][0]:.2f}]")
     print(f"            Y[{bounds[0][1]:.2f}, {bounds[1][1]:.2f}]") 
@@ -51,48 +77,60 @@ def analyze_starship_calypso(vertices, bounds, center):
     # - Main wing area: Z ~ -20 to 20  
     # - Engine area: Z > 40
     
+    # Contiguous copies of the X and Z columns, read by every selection below
+    x = np.ascontiguousarray(vertices[:, 0])
+    z = np.ascontiguousarray(vertices[:, 2])
+    
+    # Sort Z once; the front and rear sections are then contiguous runs of that order
+    z_order = np.argsort(z, kind='stable')
+    z_sorted = z[z_order]
+    
     # Find front weapon positions by looking at wing tips in front section
-    front_section = vertices[vertices[:, 2] < -35]  # Front 25% based on visual analysis
+    front_section = vertices[z_order[:np.searchsorted(z_sorted, -35, side='left')]]  # Front 25% based on visual analysis
     
     if len(front_section) > 0:
         print(f"Front section: {len(front_section)} vertices")
-        print(f"  X range: [{front_section[:, 0].min():.1f}, {front_section[:, 0].max():.1f}]")
-        print(f"  Y range: [{front_section[:, 1].min():.1f}, {front_section[:, 1].max():.1f}]")
-        print(f"  Z range: [{front_section[:, 2].min():.1f}, {front_section[:, 2].max():.1f}]")
+        lo, hi = front_section.min(axis=0), front_section.max(axis=0)
+        print(f"  X range: [{lo[0]:.1f}, {hi[0]:.1f}]")
+        print(f"  Y range: [{lo[1]:.1f}, {hi[1]:.1f}]")
+        print(f"  Z range: [{lo[2]:.1f}, {hi[2]:.1f}]")
         
         # Look for weapon positions at the extreme wing tips
         # Based on cross-sections, the ship has distinct left and right structures
         
-        # Find leftmost and rightmost points in front section
-        left_extreme = front_section[front_section[:, 0] == front_section[:, 0].min()]
-        right_extreme = front_section[front_section[:, 0] == front_section[:, 0].max()]
-        
-        # Get the most forward points of each wing tip
-        left_weapon = left_extreme[left_extreme[:, 2] == left_extreme[:, 2].min()][0]
-        right_weapon = right_extreme[right_extreme[:, 2] == right_extreme[:, 2].min()][0]
+        # Leftmost and rightmost points in front section are the wing tips, ties going to the most forward point
+        left_weapon = front_section[np.lexsort((front_section[:, 2], front_section[:, 0]))[0]]
+        right_weapon = front_section[np.lexsort((front_section[:, 2], -front_section[:, 0]))[0]]
         
         print(f"  Left wing tip weapon: [{left_weapon[0]:.1f}, {left_weapon[1]:.1f}, {left_weapon[2]:.1f}]")
         print(f"  Right wing tip weapon: [{right_weapon[0]:.1f}, {right_weapon[1]:.1f}, {right_weapon[2]:.1f}]")
     
     # Find engine positions in rear section
-    rear_section = vertices[vertices[:, 2] > 35]  # Rear 25% based on visual analysis
+    rear_section = vertices[z_order[np.searchsorted(z_sorted, 35, side='right'):]]  # Rear 25% based on visual analysis
     
     if len(rear_section) > 0:
         print(f"\nRear section: {len(rear_section)} vertices")
-        print(f"  X range: [{rear_section[:, 0].min():.1f}, {rear_section[:, 0].max():.1f}]")
-        print(f"  Y range: [{rear_section[:, 1].min():.1f}, {rear_section[:, 1].max():.1f}]")
-        print(f"  Z range: [{rear_section[:, 2].min():.1f}, {rear_section[:, 2].max():.1f}]")
+        lo, hi = rear_section.min(axis=0), rear_section.max(axis=0)
+        print(f"  X range: [{lo[0]:.1f}, {hi[0]:.1f}]")
+        print(f"  Y range: [{lo[1]:.1f}, {hi[1]:.1f}]")
+        print(f"  Z range: [{lo[2]:.1f}, {hi[2]:.1f}]")
         
-        # Find the rearmost point (main engine)
-        main_engine = rear_section[rear_section[:, 2] == rear_section[:, 2].max()]
-        main_engine_center = np.mean(main_engine, axis=0)
+        # Find the rearmost point (main engine), averaging the vertices of a flat rear face
+        rear_z = rear_section[:, 2]
+        at_max = rear_z == rear_z.max()
+        if np.count_nonzero(at_max) > 1:
+            main_engine_center = np.mean(rear_section[at_max], axis=0)
+        else:
+            main_engine_center = rear_section[np.argmax(rear_z)]
         
         print(f"  Main engine (rearmost): [{main_engine_center[0]:.1f}, {main_engine_center[1]:.1f}, {main_engine_center[2]:.1f}]")
         
-        # Find secondary engines at wing positions
-        rear_left = rear_section[rear_section[:, 0] < center[0]]
-        rear_right = rear_section[rear_section[:, 0] > center[0]]
+        # Find secondary engines at wing positions (side of centroid computed once: -1 left, +1 right)
+        rear_side = np.sign(rear_section[:, 0] - center[0])
+        rear_left = rear_section[rear_side < 0]
+        rear_right = rear_section[rear_side > 0]
         
+        left_engine = right_engine = np.zeros(3)
         if len(rear_left) > 0:
             left_engine = np.mean(rear_left, axis=0)
             print(f"  Left wing engine: [{left_engine[0]:.1f}, {left_engine[1]:.1f}, {left_engine[2]:.1f}]")
@@ -101,110 +139,108 @@ def analyze_starship_calypso(vertices, bounds, center):
             right_engine = np.mean(rear_right, axis=0)
             print(f"  Right wing engine: [{right_engine[0]:.1f}, {right_engine[1]:.1f}, {right_engine[2]:.1f}]")
     
-    # Analyze ship asymmetry
-    left_side = vertices[vertices[:, 0] < center[0]]
-    right_side = vertices[vertices[:, 0] > center[0]]
+    # Analyze ship asymmetry: count vertices left of, on and right of the centroid in one pass
+    n_left, _, n_right = np.bincount((np.sign(x - center[0]) + 1).astype(np.intp), minlength=3)
     
     print(f"\nAsymmetry analysis:")
-    print(f"  Left side vertices: {len(left_side)}")
-    print(f"  Right side vertices: {len(right_side)}")
-    print(f"  Asymmetry ratio: {len(right_side)/len(left_side):.2f}")
+    print(f"  Left side vertices: {n_left}")
+    print(f"  Right side vertices: {n_right}")
+    print(f"  Asymmetry ratio: {n_right/n_left:.2f}")
     
     # Return corrected hardpoints based on actual structure analysis
     return {
-        'weapons': [
-            {'pos': left_weapon, 'type': 'left_cannon'},
-            {'pos': right_weapon, 'type': 'right_cannon'}
-        ],
-        'engines': [
-            {'pos': main_engine_center, 'scale': 1.0, 'type': 'main'},
-            {'pos': left_engine if 'left_engine' in locals() else [0,0,0], 'scale': 0.6, 'type': 'left_secondary'},
-            {'pos': right_engine if 'right_engine' in locals() else [0,0,0], 'scale': 0.6, 'type': 'right_secondary'}
-        ]
+        'weapon_positions': np.stack([left_weapon, right_weapon]),
+        'weapon_types': ['left_cannon', 'right_cannon'],
+        'engine_positions': np.stack([main_engine_center, left_engine, right_engine]),
+        'engine_scales': np.array([1.0, 0.6, 0.6]),
+        'engine_types': ['main', 'left_secondary', 'right_secondary']
     }
 
 def analyze_sky_predator(vertices, bounds, center):
     """Analyze Sky Predator structure for actual hardpoints"""
     print("\nAnalyzing Sky Predator structure...")
     
-    # Much smaller, simpler ship - find nose and tail
-    front_section = vertices[vertices[:, 2] < center[2]]
-    rear_section = vertices[vertices[:, 2] > center[2]]
+    # Much smaller, simpler ship - find nose and tail (only the section sizes are needed)
+    z = np.ascontiguousarray(vertices[:, 2])
+    z_min, z_max = z.min(), z.max()
+    n_front = np.count_nonzero(z < center[2])
+    n_rear = np.count_nonzero(z > center[2])
     
-    print(f"Front section: {len(front_section)} vertices")
-    print(f"Rear section: {len(rear_section)} vertices")
+    print(f"Front section: {n_front} vertices")
+    print(f"Rear section: {n_rear} vertices")
     
-    # Find the absolute front point (nose) for weapon
-    front_point = vertices[vertices[:, 2] == vertices[:, 2].min()]
-    nose_weapon = np.mean(front_point, axis=0)
+    # Find the absolute front point (nose) for weapon and the absolute rear point for engine,
+    # averaging the tied vertices only when the extreme is shared
+    nose_weapon = vertices[np.argmin(z)]
+    if np.count_nonzero(z == z_min) > 1:
+        nose_weapon = np.mean(vertices[z == z_min], axis=0)
     
-    # Find the absolute rear point for engine
-    rear_point = vertices[vertices[:, 2] == vertices[:, 2].max()]
-    rear_engine = np.mean(rear_point, axis=0)
+    rear_engine = vertices[np.argmax(z)]
+    if np.count_nonzero(z == z_max) > 1:
+        rear_engine = np.mean(vertices[z == z_max], axis=0)
     
     print(f"Nose weapon position: [{nose_weapon[0]:.2f}, {nose_weapon[1]:.2f}, {nose_weapon[2]:.2f}]")
     print(f"Rear engine position: [{rear_engine[0]:.2f}, {rear_engine[1]:.2f}, {rear_engine[2]:.2f}]")
     
     return {
-        'weapons': [
-            {'pos': nose_weapon, 'type': 'nose_cannon'}
-        ],
-        'engines': [
-            {'pos': rear_engine, 'scale': 1.0, 'type': 'main'}
-        ]
+        'weapon_positions': nose_weapon[None, :],
+        'weapon_types': ['nose_cannon'],
+        'engine_positions': rear_engine[None, :],
+        'engine_scales': np.array([1.0]),
+        'engine_types': ['main']
     }
 
 def analyze_generic_ship(vertices, bounds, center):
     """Generic analysis for unknown ships"""
     print("\nAnalyzing generic ship structure...")
     
-    # Simple front/rear analysis
-    front_quarter = vertices[vertices[:, 2] < center[2] - (bounds[1][2] - bounds[0][2]) * 0.25]
-    rear_quarter = vertices[vertices[:, 2] > center[2] + (bounds[1][2] - bounds[0][2]) * 0.25]
-    
-    weapons = []
-    engines = []
+    # Simple front/rear analysis on one Z sort
+    z = np.ascontiguousarray(vertices[:, 2])
+    z_order = np.argsort(z, kind='stable')
+    z_sorted = z[z_order]
+    quarter = (bounds[1][2] - bounds[0][2]) * 0.25
+    front_quarter = vertices[z_order[:np.searchsorted(z_sorted, center[2] - quarter, side='left')]]
+    rear_quarter = vertices[z_order[np.searchsorted(z_sorted, center[2] + quarter, side='right'):]]
+    
+    hardpoints = {
+        'weapon_positions': np.empty((0, 3)),
+        'weapon_types': [],
+        'engine_positions': np.empty((0, 3)),
+        'engine_scales': np.empty(0),
+        'engine_types': []
+    }
     
     if len(front_quarter) > 0:
-        front_center = np.mean(front_quarter, axis=0)
-        weapons.append({'pos': front_center, 'type': 'forward_cannon'})
+        hardpoints['weapon_positions'] = np.mean(front_quarter, axis=0)[None, :]
+        hardpoints['weapon_types'] = ['forward_cannon']
     
     if len(rear_quarter) > 0:
-        rear_center = np.mean(rear_quarter, axis=0)
-        engines.append({'pos': rear_center, 'scale': 1.0, 'type': 'main'})
+        hardpoints['engine_positions'] = np.mean(rear_quarter, axis=0)[None, :]
+        hardpoints['engine_scales'] = np.array([1.0])
+        hardpoints['engine_types'] = ['main']
     
-    return {
-        'weapons': weapons,
-        'engines': engines
-    }
+    return hardpoints
 
-def create_visual_hardpoint_analysis(file_path, model_name, hardpoints):
+def create_visual_hardpoint_analysis(ship, model_name, hardpoints):
     """Create visualization showing the found hardpoints"""
-    scene = trimesh.load(file_path)
+    # A 20k-point sample keeps the silhouette and makes the three scatters much cheaper to draw
+    vertices = ship.vertices
+    if len(vertices) > 20000:
+        vertices = vertices[np.random.default_rng(0).choice(len(vertices), size=20000, replace=False)]
     
-    if isinstance(scene, trimesh.Scene):
-        meshes = [mesh for mesh in scene.geometry.values() if isinstance(mesh, trimesh.Trimesh)]
-        combined = trimesh.util.concatenate(meshes) if len(meshes) > 1 else meshes[0]
-    else:
-        combined = scene
-    
-    vertices = combined.vertices
+    # One scatter per hardpoint kind and view; the legend lists the types in order
+    weapons = hardpoints['weapon_positions']
+    engines = hardpoints['engine_positions']
+    weapon_label = f"Weapons: {', '.join(hardpoints['weapon_types'])}"
+    engine_label = f"Engines: {', '.join(hardpoints['engine_types'])}"
     
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
     
     # Top view with hardpoints
     ax1 = axes[0]
     ax1.scatter(vertices[:, 0], vertices[:, 2], s=0.1, alpha=0.3, c='blue')
-    
-    # Plot weapon hardpoints
-    for weapon in hardpoints['weapons']:
-        pos = weapon['pos']
-        ax1.scatter(pos[0], pos[2], s=100, c='red', marker='^', label=f"Weapon: {weapon['type']}")
-    
-    # Plot engine hardpoints
-    for engine in hardpoints['engines']:
-        pos = engine['pos']
-        ax1.scatter(pos[0], pos[2], s=100, c='orange', marker='s', label=f"Engine: {engine['type']}")
+    ax1.scatter(weapons[:, 0], weapons[:, 2], s=100, c='red', marker='^', label=weapon_label)
+    ax1.scatter(engines[:, 0], engines[:, 2], s=100, c='orange', marker='s', label=engine_label)
     
     ax1.set_title(f'{model_name} - Top View with Hardpoints')
     ax1.set_xlabel('X'); ax1.set_ylabel('Z')
@@ -215,14 +251,8 @@ def create_visual_hardpoint_analysis(file_path, model_name, hardpoints):
     # Side view with hardpoints
     ax2 = axes[1]
     ax2.scatter(vertices[:, 1], vertices[:, 2], s=0.1, alpha=0.3, c='blue')
-    
-    for weapon in hardpoints['weapons']:
-        pos = weapon['pos']
-        ax2.scatter(pos[1], pos[2], s=100, c='red', marker='^', label=f"Weapon: {weapon['type']}")
-    
-    for engine in hardpoints['engines']:
-        pos = engine['pos']
-        ax2.scatter(pos[1], pos[2], s=100, c='orange', marker='s', label=f"Engine: {engine['type']}")
+    ax2.scatter(weapons[:, 1], weapons[:, 2], s=100, c='red', marker='^', label=weapon_label)
+    ax2.scatter(engines[:, 1], engines[:, 2], s=100, c='orange', marker='s', label=engine_label)
     
     ax2.set_title(f'{model_name} - Side View with Hardpoints')
     ax2.set_xlabel('Y'); ax2.set_ylabel('Z')
@@ -233,14 +263,8 @@ def create_visual_hardpoint_analysis(file_path, model_name, hardpoints):
     # Front view with hardpoints
     ax3 = axes[2]
     ax3.scatter(vertices[:, 0], vertices[:, 1], s=0.1, alpha=0.3, c='blue')
-    
-    for weapon in hardpoints['weapons']:
-        pos = weapon['pos']
-        ax3.scatter(pos[0], pos[1], s=100, c='red', marker='^', label=f"Weapon: {weapon['type']}")
-    
-    for engine in hardpoints['engines']:
-        pos = engine['pos']
-        ax3.scatter(pos[0], pos[1], s=100, c='orange', marker='s', label=f"Engine: {engine['type']}")
+    ax3.scatter(weapons[:, 0], weapons[:, 1], s=100, c='red', marker='^', label=weapon_label)
+    ax3.scatter(engines[:, 0], engines[:, 1], s=100, c='orange', marker='s', label=engine_label)
     
     ax3.set_title(f'{model_name} - Front View with Hardpoints')
     ax3.set_xlabel('X'); ax3.set_ylabel('Y')
@@ -252,6 +276,13 @@ def create_visual_hardpoint_analysis(file_path, model_name, hardpoints):
     plt.savefig(f'{model_name}_intelligent_hardpoints.png', dpi=150, bbox_inches='tight')
     print(f"Intelligent hardpoint analysis saved as {model_name}_intelligent_hardpoints.png")
 
+def process_model(model_info):
+    """Analyze and plot one ship, returning its hardpoints"""
+    ship = load_ship(model_info['path'])
+    hardpoints = find_intelligent_hardpoints(ship, model_info['name'])
+    create_visual_hardpoint_analysis(ship, model_info['name'], hardpoints)
+    return hardpoints
+
 def main():
     """Analyze both ship models intelligently"""
     models = [
@@ -267,13 +298,9 @@ def main():
     
     all_hardpoints = {}
     
-    for model in models:
-        if os.path.exists(model['path']):
-            hardpoints = find_intelligent_hardpoints(model['path'], model['name'])
+    for model, hardpoints in zip(models, run_per_model(process_model, models)):
+        if hardpoints is not None:
             all_hardpoints[model['name']] = hardpoints
-            create_visual_hardpoint_analysis(model['path'], model['name'], hardpoints)
-        else:
-            print(f"File not found: {model['path']}")
     
     # Generate corrected configuration
     print("\n" + "="*70)
@@ -283,17 +310,14 @@ def main():
     for ship_name, hardpoints in all_hardpoints.items():
         print(f"\n'{ship_name}': {{")
         print("    'weaponHardpoints': [")
-        for weapon in hardpoints['weapons']:
-            pos = weapon['pos']
-            print(f"        {{ position: {{ x: {pos[0]:.1f}, y: {pos[1]:.1f}, z: {pos[2]:.1f} }}, type: '{weapon['type']}' }},")
+        for pos, weapon_type in zip(hardpoints['weapon_positions'], hardpoints['weapon_types']):
+            print(f"        {{ position: {{ x: {pos[0]:.1f}, y: {pos[1]:.1f}, z: {pos[2]:.1f} }}, type: '{weapon_type}' }},")
         print("    ],")
         print("    'enginePositions': [")
-        for engine in hardpoints['engines']:
-            pos = engine['pos']
-            print(f"        {{ position: {{ x: {pos[0]:.1f}, y: {pos[1]:.1f}, z: {pos[2]:.1f} }}, scale: {engine['scale']}, type: '{engine['type']}' }},")
+        for pos, scale, engine_type in zip(hardpoints['engine_positions'], hardpoints['engine_scales'], hardpoints['engine_types']):
+            print(f"        {{ position: {{ x: {pos[0]:.1f}, y: {pos[1]:.1f}, z: {pos[2]:.1f} }}, scale: {scale}, type: '{engine_type}' }},")
         print("    ]")
         print("},")
 
 if __name__ == "__main__":
-    import os
     main() 
\ No newline at end of file
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+JIT
+numba's njit when it is installed, otherwise a no-op decorator so the kernels run as plain Python
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback so the kernels run as plain Python when numba is not installed"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
@@ -4,9 +4,49 @@ GLB Model Dimension Measurement Script
 Accurately measures the dimensions of GLB models using trimesh
 """
 
+import json
+import struct
 import trimesh
 import numpy as np
-import os
+from glb_loader import node_matrix
+from model_pool import run_per_model
+
+def glb_header_bounds(file_path):
+    """Scene bounds from the POSITION accessor min/max in a GLB's JSON chunk, or None if unavailable"""
+    with open(file_path, 'rb') as f:
+        magic, _, _ = struct.unpack('<4sII', f.read(12))
+        chunk_length, chunk_type = struct.unpack('<I4s', f.read(8))
+        if magic != b'glTF' or chunk_type != b'JSON':
+            return None
+        gltf = json.loads(f.read(chunk_length))
+    
+    accessors = gltf.get('accessors', [])
+    meshes = gltf.get('meshes', [])
+    nodes = gltf.get('nodes', [])
+    scenes = gltf.get('scenes', [])
+    if not scenes:
+        return None
+    
+    corners = []
+    stack = [(index, np.eye(4)) for index in scenes[gltf.get('scene', 0)].get('nodes', [])]
+    while stack:
+        index, parent = stack.pop()
+        node = nodes[index]
+        world = parent @ node_matrix(node)
+        if 'mesh' in node:
+            for primitive in meshes[node['mesh']]['primitives']:
+                accessor = accessors[primitive['attributes']['POSITION']]
+                if 'min' not in accessor or 'max' not in accessor:
+                    return None
+                lo, hi = accessor['min'], accessor['max']
+                box = np.array([[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])])
+                corners.append(trimesh.transformations.transform_points(box, world))
+        stack.extend((child, world) for child in node.get('children', []))
+    
+    if not corners:
+        return None
+    corners = np.vstack(corners)
+    return np.array([corners.min(axis=0), corners.max(axis=0)])
 
 def measure_glb_model(file_path, model_name):
     """Measure the actual dimensions of a GLB model"""
@@ -14,22 +54,25 @@ def measure_glb_model(file_path, model_name):
     print(f"File: {file_path}")
     
     try:
-        # Load the GLB file
-        mesh = trimesh.load(file_path)
+        # Bounds straight from the GLB header; only decode the geometry when that isn't possible
+        bounds = glb_header_bounds(file_path)
         
-        # If it's a scene (multiple meshes), get the combined bounds
-        if hasattr(mesh, 'bounds'):
-            bounds = mesh.bounds
-        else:
-            # If it's a scene, get the bounding box of the whole scene
-            bounds = mesh.bounding_box.bounds
+        if bounds is None:
+            mesh = trimesh.load(file_path)
+            
+            # If it's a scene (multiple meshes), get the combined bounds
+            if hasattr(mesh, 'bounds'):
+                bounds = mesh.bounds
+            else:
+                # If it's a scene, get the bounding box of the whole scene
+                bounds = mesh.bounding_box.bounds
             
         # Calculate dimensions
         min_bounds = bounds[0]  # [x_min, y_min, z_min]
         max_bounds = bounds[1]  # [x_max, y_max, z_max]
         
-        dimensions = max_bounds - min_bounds
-        center = (max_bounds + min_bounds) / 2
+        dimensions = np.ptp(bounds, axis=0)
+        center = np.mean(bounds, axis=0)
         
         print(f"Bounding Box:")
         print(f"  Min: [{min_bounds[0]:.3f}, {min_bounds[1]:.3f}, {min_bounds[2]:.3f}]")
@@ -65,6 +108,16 @@ def measure_glb_model(file_path, model_name):
         print(f"Error loading {file_path}: {e}")
         return None
 
+def _mirror_pairs(positions):
+    """Follow each (x, y, z) row with its mirror (-x, y, z)"""
+    return np.stack([positions, positions * [-1, 1, 1]], axis=1).reshape(-1, 3)
+
+def _format_positions(positions, fields):
+    """Format (N,3) positions as config entries, appending the matching trailing fields"""
+    # Placeholder zeros (including mirrored -0.0) are written as a bare 0, as in the hand-written entries
+    coords = np.where(positions == 0, '0', np.char.mod('%.1f', positions))
+    return [f"{{ position: {{ x: {x}, y: {y}, z: {z} }}, {extra} }}" for (x, y, z), extra in zip(coords, fields)]
+
 def generate_ship_config(measurements):
     """Generate ship configuration based on actual measurements"""
     print(f"\n=== Generated Configuration for {measurements['name']} ===")
@@ -79,62 +132,62 @@ def generate_ship_config(measurements):
     
     print(f"nativeLength: {native_length:.3f}")
     
-    # Generate engine positions based on actual rear of model
-    engines = []
+    # Generate engine positions based on actual rear of model. Positions are built as (N,3)
+    # arrays with mirrored pairs expanded in one step, then formatted together
+    engine_pos = np.empty((0, 3))
+    engine_scales = []
+    engine_types = []
     
     if measurements['name'] == 'Starship_Calypso':
         # Main engine at rear center
-        engines.append(f"{{ position: {{ x: 0, y: 0, z: {rear_z-5:.1f} }}, scale: 1.0, type: 'main' }}")
+        main = np.array([[0, 0, rear_z - 5]])
         
-        # Secondary engines slightly forward and to sides
-        engines.append(f"{{ position: {{ x: {width*0.15:.1f}, y: 0, z: {rear_z-10:.1f} }}, scale: 0.7, type: 'secondary' }}")
-        engines.append(f"{{ position: {{ x: {-width*0.15:.1f}, y: 0, z: {rear_z-10:.1f} }}, scale: 0.7, type: 'secondary' }}")
-        
-        # Maneuvering thrusters at extremities
-        # Top thrusters
-        engines.append(f"{{ position: {{ x: {width*0.2:.1f}, y: {height*0.3:.1f}, z: {rear_z-20:.1f} }}, scale: 0.3, type: 'maneuvering' }}")
-        engines.append(f"{{ position: {{ x: {-width*0.2:.1f}, y: {height*0.3:.1f}, z: {rear_z-20:.1f} }}, scale: 0.3, type: 'maneuvering' }}")
-        
-        # Bottom thrusters
-        engines.append(f"{{ position: {{ x: {width*0.2:.1f}, y: {-height*0.3:.1f}, z: {rear_z-20:.1f} }}, scale: 0.3, type: 'maneuvering' }}")
-        engines.append(f"{{ position: {{ x: {-width*0.2:.1f}, y: {-height*0.3:.1f}, z: {rear_z-20:.1f} }}, scale: 0.3, type: 'maneuvering' }}")
-        
-        # Side thrusters
-        engines.append(f"{{ position: {{ x: {width*0.4:.1f}, y: 0, z: {center[2]:.1f} }}, scale: 0.3, type: 'maneuvering' }}")
-        engines.append(f"{{ position: {{ x: {-width*0.4:.1f}, y: 0, z: {center[2]:.1f} }}, scale: 0.3, type: 'maneuvering' }}")
-        
-        # Forward thrusters for braking
-        engines.append(f"{{ position: {{ x: {width*0.15:.1f}, y: {height*0.1:.1f}, z: {front_z+20:.1f} }}, scale: 0.25, type: 'maneuvering' }}")
-        engines.append(f"{{ position: {{ x: {-width*0.15:.1f}, y: {height*0.1:.1f}, z: {front_z+20:.1f} }}, scale: 0.25, type: 'maneuvering' }}")
+        # Mirrored pairs: secondary engines slightly forward and to sides, top and bottom
+        # maneuvering thrusters, side thrusters, and forward thrusters for braking
+        pairs = np.array([
+            [width * 0.15, 0, rear_z - 10],
+            [width * 0.2, height * 0.3, rear_z - 20],
+            [width * 0.2, -height * 0.3, rear_z - 20],
+            [width * 0.4, 0, center[2]],
+            [width * 0.15, height * 0.1, front_z + 20],
+        ])
+        engine_pos = np.vstack([main, _mirror_pairs(pairs)])
+        engine_scales = [1.0] + [0.7] * 2 + [0.3] * 6 + [0.25] * 2
+        engine_types = ['main'] + ['secondary'] * 2 + ['maneuvering'] * 8
         
     elif measurements['name'] == 'Sky_Predator':
-        # Main engine at rear
-        engines.append(f"{{ position: {{ x: 0, y: 0, z: {rear_z-2:.1f} }}, scale: 0.8, type: 'main' }}")
-        
-        # Secondary engines
-        engines.append(f"{{ position: {{ x: {width*0.15:.1f}, y: 0, z: {rear_z-4:.1f} }}, scale: 0.5, type: 'secondary' }}")
-        engines.append(f"{{ position: {{ x: {-width*0.15:.1f}, y: 0, z: {rear_z-4:.1f} }}, scale: 0.5, type: 'secondary' }}")
-        
-        # Maneuvering thrusters
-        engines.append(f"{{ position: {{ x: {width*0.25:.1f}, y: {height*0.2:.1f}, z: {rear_z-6:.1f} }}, scale: 0.2, type: 'maneuvering' }}")
-        engines.append(f"{{ position: {{ x: {-width*0.25:.1f}, y: {height*0.2:.1f}, z: {rear_z-6:.1f} }}, scale: 0.2, type: 'maneuvering' }}")
-        engines.append(f"{{ position: {{ x: {width*0.25:.1f}, y: {-height*0.2:.1f}, z: {rear_z-6:.1f} }}, scale: 0.2, type: 'maneuvering' }}")
-        engines.append(f"{{ position: {{ x: {-width*0.25:.1f}, y: {-height*0.2:.1f}, z: {rear_z-6:.1f} }}, scale: 0.2, type: 'maneuvering' }}")
+        # Main engine at rear, then mirrored secondary engines and maneuvering thrusters
+        main = np.array([[0, 0, rear_z - 2]])
+        pairs = np.array([
+            [width * 0.15, 0, rear_z - 4],
+            [width * 0.25, height * 0.2, rear_z - 6],
+            [width * 0.25, -height * 0.2, rear_z - 6],
+        ])
+        engine_pos = np.vstack([main, _mirror_pairs(pairs)])
+        engine_scales = [0.8] + [0.5] * 2 + [0.2] * 4
+        engine_types = ['main'] + ['secondary'] * 2 + ['maneuvering'] * 4
+    
+    engines = _format_positions(engine_pos, [f"scale: {scale}, type: '{kind}'"
+                                             for scale, kind in zip(engine_scales, engine_types)])
     
     print("Engine Positions:")
     for engine in engines:
         print(f"  {engine}")
     
     # Generate weapon positions based on front of model
-    weapons = []
+    weapon_pos = np.empty((0, 3))
+    weapon_types = []
     if measurements['name'] == 'Starship_Calypso':
-        weapons.append(f"{{ position: {{ x: {width*0.1:.1f}, y: {height*0.1:.1f}, z: {front_z+5:.1f} }}, type: 'cannon' }}")
-        weapons.append(f"{{ position: {{ x: {-width*0.1:.1f}, y: {height*0.1:.1f}, z: {front_z+5:.1f} }}, type: 'cannon' }}")
-        weapons.append(f"{{ position: {{ x: {width*0.05:.1f}, y: {-height*0.05:.1f}, z: {front_z+15:.1f} }}, type: 'blaster' }}")
-        weapons.append(f"{{ position: {{ x: {-width*0.05:.1f}, y: {-height*0.05:.1f}, z: {front_z+15:.1f} }}, type: 'blaster' }}")
+        weapon_pos = _mirror_pairs(np.array([
+            [width * 0.1, height * 0.1, front_z + 5],
+            [width * 0.05, -height * 0.05, front_z + 15],
+        ]))
+        weapon_types = ['cannon'] * 2 + ['blaster'] * 2
     elif measurements['name'] == 'Sky_Predator':
-        weapons.append(f"{{ position: {{ x: {width*0.1:.1f}, y: 0, z: {front_z+2:.1f} }}, type: 'blaster' }}")
-        weapons.append(f"{{ position: {{ x: {-width*0.1:.1f}, y: 0, z: {front_z+2:.1f} }}, type: 'blaster' }}")
+        weapon_pos = _mirror_pairs(np.array([[width * 0.1, 0, front_z + 2]]))
+        weapon_types = ['blaster'] * 2
+    
+    weapons = _format_positions(weapon_pos, [f"type: '{kind}'" for kind in weapon_types])
     
     print("Weapon Positions:")
     for weapon in weapons:
@@ -146,6 +199,13 @@ def generate_ship_config(measurements):
         'native_length': native_length
     }
 
+def process_model(model_info):
+    """Measure one model and print its config, returning the measurement"""
+    measurement = measure_glb_model(model_info['path'], model_info['name'])
+    if measurement:
+        generate_ship_config(measurement)
+    return measurement
+
 def main():
     """Main function to measure all models"""
     models_to_measure = [
@@ -161,14 +221,9 @@ def main():
     
     all_measurements = []
     
-    for model_info in models_to_measure:
-        if os.path.exists(model_info['path']):
-            measurement = measure_glb_model(model_info['path'], model_info['name'])
-            if measurement:
-                all_measurements.append(measurement)
-                config = generate_ship_config(measurement)
-        else:
-            print(f"File not found: {model_info['path']}")
+    for measurement in run_per_model(process_model, models_to_measure):
+        if measurement:
+            all_measurements.append(measurement)
     
     print("\n" + "="*60)
     print("SUMMARY OF MEASUREMENTS")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Model Pool
+Runs a per-model analysis in worker processes and prints each report in model order
+"""
+
+import io
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+
+def _run_captured(fn, model, args):
+    """Run fn(model, *args) in a worker, returning its captured output, result and any traceback"""
+    buffer = io.StringIO()
+    result = error = None
+    with redirect_stdout(buffer):
+        try:
+            if os.path.exists(model['path']):
+                result = fn(model, *args)
+            else:
+                print(f"File not found: {model['path']}")
+        except Exception:
+            # Keep whatever the model printed before failing
+            error = traceback.format_exc()
+    return buffer.getvalue(), result, error
+
+def _run_isolated(fn, model, args):
+    """Run one model in a fresh single-worker pool, reporting a dead worker as an error"""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        try:
+            return executor.submit(_run_captured, fn, model, args).result()
+        except BrokenProcessPool as e:
+            # The worker itself died (e.g. killed for memory), so its output is gone
+            return '', None, f"{type(e).__name__}: {e}\n"
+
+def run_per_model(fn, models, *args):
+    """Run fn(model, *args) for each model in its own process, print the reports in model order and return the results"""
+    results = []
+    with ProcessPoolExecutor(max_workers=max(min(len(models), os.cpu_count() or 1), 1)) as executor:
+        futures = [executor.submit(_run_captured, fn, model, args) for model in models]
+        for model, future in zip(models, futures):
+            try:
+                output, result, error = future.result()
+            except BrokenProcessPool:
+                # A dead worker breaks the whole pool, so rerun each remaining model on its own;
+                # only a model that kills its own worker is lost
+                output, result, error = _run_isolated(fn, model, args)
+            print(output, end='')
+            if error:
+                print(f"Error processing {model['name']}:\n{error}", end='')
+            results.append(result)
+    return results
@@ -4,27 +4,76 @@ Render Actual Ships
 Actually renders the 3D models so we can SEE the ship structure
 """
 
+import os
+from functools import lru_cache
 import trimesh
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from PIL import Image
 import io
+import sys
+from model_pool import run_per_model
+from jit import njit
 
-def render_ship_views(file_path, model_name):
-    """Render the ship from multiple angles to see actual structure"""
-    print(f"\n{'='*60}")
-    print(f"RENDERING ACTUAL SHIP: {model_name}")
-    print(f"{'='*60}")
-    
-    # Load the model
-    scene = trimesh.load(file_path)
+@njit(cache=True)
+def _compute_profiles(vertices, main_axis, positions, tolerance):
+    """Single pass over the vertices collecting count and per-axis extents for each slice"""
+    n_slices = positions.shape[0]
+    counts = np.zeros(n_slices, dtype=np.int64)
+    mins = np.zeros((n_slices, 3))
+    maxs = np.zeros((n_slices, 3))
+    start = positions[0]
+    # A flat model (or a single slice) has no spacing, so every slice sits at start
+    step = (positions[n_slices - 1] - start) / (n_slices - 1) if n_slices > 1 else 0.0
+    
+    for i in range(vertices.shape[0]):
+        a = vertices[i, main_axis]
+        
+        # Slice windows are narrower than the spacing, so only the nearest slice can hold this vertex
+        k = int(np.floor((a - start) / step + 0.5)) if step > 0 else 0
+        if k < 0 or k >= n_slices or abs(a - positions[k]) >= tolerance:
+            continue
+        
+        if counts[k] == 0:
+            for j in range(3):
+                mins[k, j] = vertices[i, j]
+                maxs[k, j] = vertices[i, j]
+        else:
+            for j in range(3):
+                if vertices[i, j] < mins[k, j]:
+                    mins[k, j] = vertices[i, j]
+                elif vertices[i, j] > maxs[k, j]:
+                    maxs[k, j] = vertices[i, j]
+        counts[k] += 1
+    
+    return counts, mins, maxs
+
+@lru_cache(maxsize=8)
+def _load_mesh(abs_path):
+    scene = trimesh.load(abs_path)
     
     if isinstance(scene, trimesh.Scene):
         # It's a scene, we need to get the mesh
         print("Loaded as scene")
-        mesh = scene.dump(concatenate=True)
-    else:
-        mesh = scene
+        return scene.dump(concatenate=True)
+    return scene
+
+def load_mesh(file_path):
+    """Load a GLB as one mesh, parsing each file only once"""
+    return _load_mesh(os.path.abspath(file_path))
+
+@lru_cache(maxsize=None)
+def _view_rotation(angles):
+    """Rotation matrix for a view's (x, y, z) Euler angles in degrees"""
+    return trimesh.transformations.euler_matrix(*np.radians(angles))
+
+def render_ship_views(mesh, model_name):
+    """Render the ship from multiple angles to see actual structure"""
+    print(f"\n{'='*60}")
+    print(f"RENDERING ACTUAL SHIP: {model_name}")
+    print(f"{'='*60}")
     
     print(f"Mesh info: {len(mesh.vertices)} vertices, {len(mesh.faces)} faces")
     print(f"Bounds: {mesh.bounds}")
@@ -34,42 +83,34 @@ def render_ship_views(file_path, model_name):
     
     # Define camera angles for different views
     views = [
-        ('Top', [0, -90, 0]),      # Looking down from above
-        ('Bottom', [0, 90, 0]),    # Looking up from below
-        ('Front', [0, 0, 0]),      # Looking from front
-        ('Back', [0, 180, 0]),     # Looking from back
-        ('Left', [0, -90, 90]),    # Looking from left side
-        ('Right', [0, 90, -90]),   # Looking from right side
-        ('Iso1', [30, -45, 0]),    # Isometric view 1
-        ('Iso2', [30, 135, 0]),    # Isometric view 2
+        ('Top', (0, -90, 0)),      # Looking down from above
+        ('Bottom', (0, 90, 0)),    # Looking up from below
+        ('Front', (0, 0, 0)),      # Looking from front
+        ('Back', (0, 180, 0)),     # Looking from back
+        ('Left', (0, -90, 90)),    # Looking from left side
+        ('Right', (0, 90, -90)),   # Looking from right side
+        ('Iso1', (30, -45, 0)),    # Isometric view 1
+        ('Iso2', (30, 135, 0)),    # Isometric view 2
     ]
     
+    # Build the render scene once; each view only moves the camera
+    scene = mesh.scene()
+    
+    # Position camera at a good distance (the bounding sphere is solved once, not per view)
+    camera_distance = mesh.bounding_sphere.primitive.radius * 3
+    base_transform = np.eye(4)
+    base_transform[:3, 3] = [0, 0, camera_distance]
+    
     for i, (view_name, angles) in enumerate(views):
         ax = fig.add_subplot(3, 3, i+1)
         
-        # Create a scene for rendering
-        scene = mesh.scene()
-        
-        # Set up camera angle
-        # Convert angles to rotation matrix
-        R = trimesh.transformations.euler_matrix(
-            np.radians(angles[0]), 
-            np.radians(angles[1]), 
-            np.radians(angles[2])
-        )
-        
-        # Position camera at a good distance
-        camera_distance = mesh.bounding_sphere.primitive.radius * 3
-        camera_transform = np.eye(4)
-        camera_transform[:3, 3] = [0, 0, camera_distance]
-        camera_transform = R @ camera_transform
-        
-        scene.camera_transform = camera_transform
+        # Set up camera angle by rotating the base camera position
+        scene.camera_transform = _view_rotation(angles) @ base_transform
         
         # Render the scene
         try:
-            # Get the PNG image
-            png = scene.save_image(resolution=[800, 800], visible=True)
+            # Get the PNG image; 400x400 is plenty for a thumbnail in the 3x3 grid
+            png = scene.save_image(resolution=[400, 400], visible=True)
             
             # Convert to PIL image
             image = Image.open(io.BytesIO(png))
@@ -107,52 +148,37 @@ def find_geometric_features(mesh, model_name):
     # Analyze cross-sections along main axis to find features
     num_slices = 20
     positions = np.linspace(bounds[0][main_axis], bounds[1][main_axis], num_slices)
+    tolerance = dimensions[main_axis] / (num_slices * 2)
+    other_axes = [i for i in range(3) if i != main_axis]
     
-    slice_profiles = []
-    for pos in positions:
-        # Get vertices near this slice
-        tolerance = dimensions[main_axis] / (num_slices * 2)
-        mask = np.abs(vertices[:, main_axis] - pos) < tolerance
-        slice_verts = vertices[mask]
-        
-        if len(slice_verts) > 10:
-            # Calculate profile metrics
-            other_axes = [i for i in range(3) if i != main_axis]
-            width = slice_verts[:, other_axes[0]].max() - slice_verts[:, other_axes[0]].min()
-            height = slice_verts[:, other_axes[1]].max() - slice_verts[:, other_axes[1]].min()
-            area = width * height
-            center = slice_verts.mean(axis=0)
-            
-            slice_profiles.append({
-                'position': pos,
-                'width': width,
-                'height': height,
-                'area': area,
-                'center': center,
-                'vertex_count': len(slice_verts)
-            })
+    # All slice profiles in one compiled pass (no sort needed)
+    counts, mins, maxs = _compute_profiles(np.asarray(vertices, dtype=np.float64), main_axis, positions, tolerance)
+    keep = counts > 10
+    
+    positions = positions[keep]
+    counts = counts[keep]
+    extents = maxs[keep] - mins[keep]
+    widths = extents[:, other_axes[0]]
+    heights = extents[:, other_axes[1]]
+    areas = widths * heights
     
     # Identify features based on profile changes
-    if slice_profiles:
-        areas = [p['area'] for p in slice_profiles]
+    if keep.any():
         max_area_idx = np.argmax(areas)
         
         print(f"\nShip profile analysis:")
-        print(f"  Widest section at position {slice_profiles[max_area_idx]['position']:.2f}")
-        print(f"  Max width: {max(p['width'] for p in slice_profiles):.2f}")
-        print(f"  Max height: {max(p['height'] for p in slice_profiles):.2f}")
+        print(f"  Widest section at position {positions[max_area_idx]:.2f}")
+        print(f"  Max width: {widths.max():.2f}")
+        print(f"  Max height: {heights.max():.2f}")
         
         # Look for engine exhausts (typically at one end with multiple circular features)
-        rear_profiles = slice_profiles[-5:]  # Last 5 slices
-        front_profiles = slice_profiles[:5]  # First 5 slices
-        
+        # Rear is the last 5 slices, front the first 5
+        profile = np.column_stack([positions, areas, counts])
         print(f"\nRear section analysis:")
-        for p in rear_profiles:
-            print(f"  Position {p['position']:.1f}: area={p['area']:.1f}, vertices={p['vertex_count']}")
+        np.savetxt(sys.stdout, profile[-5:], fmt='  Position %.1f: area=%.1f, vertices=%d')
         
         print(f"\nFront section analysis:")
-        for p in front_profiles:
-            print(f"  Position {p['position']:.1f}: area={p['area']:.1f}, vertices={p['vertex_count']}")
+        np.savetxt(sys.stdout, profile[:5], fmt='  Position %.1f: area=%.1f, vertices=%d')
     
     # Try to identify actual features
     print(f"\nSearching for specific features...")
@@ -162,23 +188,30 @@ def find_geometric_features(mesh, model_name):
     
     # Find rear-most section
     if main_axis == 2:  # Z is main axis
-        rear_verts = vertices[vertices[:, 2] > bounds[1][2] - dimensions[2] * 0.1]
-        front_verts = vertices[vertices[:, 2] < bounds[0][2] + dimensions[2] * 0.1]
+        # Sort Z once; the front and rear tenths are contiguous runs of that order
+        z_order = np.argsort(vertices[:, 2], kind='stable')
+        z_sorted = vertices[z_order, 2]
+        rear_verts = vertices[z_order[np.searchsorted(z_sorted, bounds[1][2] - dimensions[2] * 0.1, side='right'):]]
+        front_verts = vertices[z_order[:np.searchsorted(z_sorted, bounds[0][2] + dimensions[2] * 0.1, side='left')]]
         
         print(f"  Rear section: {len(rear_verts)} vertices")
         print(f"  Front section: {len(front_verts)} vertices")
         
         if len(rear_verts) > 0:
-            # Cluster rear vertices to find engine positions
+            # Cluster rear vertices to find engine positions. Only cluster centres matter, so
+            # snap the vertices to a voxel grid first and cluster one representative per voxel
             from sklearn.cluster import DBSCAN
-            clustering = DBSCAN(eps=dimensions.max() * 0.05, min_samples=50).fit(rear_verts)
+            pitch = dimensions.max() * 0.02
+            down = np.unique(np.round(rear_verts / pitch).astype(np.int32), axis=0) * pitch
+            clustering = DBSCAN(eps=dimensions.max() * 0.05, min_samples=10,
+                                algorithm='ball_tree', n_jobs=-1).fit(down)
             n_clusters = len(set(clustering.labels_)) - (1 if -1 in clustering.labels_ else 0)
             
             print(f"  Found {n_clusters} potential engine clusters in rear")
             
             engine_positions = []
             for i in range(n_clusters):
-                cluster_verts = rear_verts[clustering.labels_ == i]
+                cluster_verts = down[clustering.labels_ == i]
                 engine_pos = cluster_verts.mean(axis=0)
                 engine_positions.append(engine_pos)
                 print(f"    Engine {i+1}: [{engine_pos[0]:.1f}, {engine_pos[1]:.1f}, {engine_pos[2]:.1f}]")
@@ -187,6 +220,12 @@ def find_geometric_features(mesh, model_name):
     
     return {}
 
+def process_model(model_info):
+    """Render and analyze one ship"""
+    mesh = load_mesh(model_info['path'])
+    render_ship_views(mesh, model_info['name'])
+    find_geometric_features(mesh, model_info['name'])
+
 def main():
     """Render and analyze ship models"""
     models = [
@@ -200,15 +239,9 @@ def main():
         }
     ]
     
-    for model in models:
-        if os.path.exists(model['path']):
-            mesh = render_ship_views(model['path'], model['name'])
-            features = find_geometric_features(mesh, model['name'])
-        else:
-            print(f"File not found: {model['path']}")
+    run_per_model(process_model, models)
 
 if __name__ == "__main__":
-    import os
     # Check if we need sklearn
     try:
         from sklearn.cluster import DBSCAN
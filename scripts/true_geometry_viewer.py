@@ -4,10 +4,90 @@ True Geometry Viewer
 Creates detailed visualizations to actually see ship structure
 """
 
+from types import SimpleNamespace
 import trimesh
 import numpy as np
+from glb_loader import load_or_cache
+from model_pool import run_per_model
+from jit import njit
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+from matplotlib.collections import LineCollection
+
+try:
+    import pyvista as pv
+except ImportError:
+    pv = None
+
+try:
+    import cupy as cp
+    from cupyx.scipy import ndimage as gpu_ndimage
+except ImportError:
+    cp = None
+
+@njit(cache=True, fastmath=True)
+def _section_stats(vertices, front_threshold, rear_threshold, mins, maxs):
+    """Single pass collecting count, per-axis extents (into mins/maxs) and coordinate sums of the front (0) and rear (1) sections"""
+    counts = np.zeros(2, dtype=np.int64)
+    sums = np.zeros((2, 3))
+    
+    for i in range(vertices.shape[0]):
+        z = vertices[i, 2]
+        if z < front_threshold:
+            k = 0
+        elif z > rear_threshold:
+            k = 1
+        else:
+            continue
+        
+        if counts[k] == 0:
+            for j in range(3):
+                mins[k, j] = vertices[i, j]
+                maxs[k, j] = vertices[i, j]
+        else:
+            for j in range(3):
+                if vertices[i, j] < mins[k, j]:
+                    mins[k, j] = vertices[i, j]
+                elif vertices[i, j] > maxs[k, j]:
+                    maxs[k, j] = vertices[i, j]
+        for j in range(3):
+            sums[k, j] += vertices[i, j]
+        counts[k] += 1
+    
+    return counts, sums
+
+@njit(cache=True, fastmath=True)
+def _wing_sums(vertices, front_threshold, left_x, right_x):
+    """Count and coordinate sums of front-section vertices left of left_x (0) and right of right_x (1)"""
+    counts = np.zeros(2, dtype=np.int64)
+    sums = np.zeros((2, 3))
+    
+    for i in range(vertices.shape[0]):
+        if vertices[i, 2] >= front_threshold:
+            continue
+        x = vertices[i, 0]
+        if x < left_x:
+            k = 0
+        elif x > right_x:
+            k = 1
+        else:
+            continue
+        for j in range(3):
+            sums[k, j] += vertices[i, j]
+        counts[k] += 1
+    
+    return counts, sums
+
+def _decimated(mesh, face_count=2000):
+    """Quadric-decimated copy of the mesh for drawing, or None when fast_simplification is not installed"""
+    # Vertices are merged first so the seams split by the GLB export can collapse too
+    merged = trimesh.Trimesh(vertices=mesh.vertices, faces=mesh.faces)
+    try:
+        decimated = merged.simplify_quadric_decimation(face_count=face_count)
+    except ImportError:
+        return None
+    return SimpleNamespace(vertices=decimated.vertices.astype(np.float32), faces=decimated.faces.astype(np.int32))
 
 def create_detailed_visualizations(file_path, model_name):
     """Create multiple detailed views of the actual geometry"""
@@ -15,17 +95,8 @@ def create_detailed_visualizations(file_path, model_name):
     print(f"TRUE GEOMETRY VISUALIZATION: {model_name}")
     print(f"{'='*60}")
     
-    # Load the model
-    scene = trimesh.load(file_path)
-    
-    if isinstance(scene, trimesh.Scene):
-        meshes = [mesh for mesh in scene.geometry.values() if isinstance(mesh, trimesh.Trimesh)]
-        if len(meshes) > 1:
-            combined = trimesh.util.concatenate(meshes)
-        else:
-            combined = meshes[0]
-    else:
-        combined = scene
+    # Load the model geometry, from the .mesh.npz cache when it is current
+    combined = load_or_cache(file_path)
     
     bounds = combined.bounds
     center = combined.centroid
@@ -39,97 +110,121 @@ def create_detailed_visualizations(file_path, model_name):
     print(f"Centroid: [{center[0]:.2f}, {center[1]:.2f}, {center[2]:.2f}]")
     
     # Create comprehensive visualization
-    create_mesh_wireframe_view(combined, model_name)
+    create_mesh_wireframe_view(combined, model_name, _decimated(combined))
     create_cross_section_analysis(combined, model_name)
     create_density_maps(combined, model_name)
     
     return combined
 
-def create_mesh_wireframe_view(mesh, model_name):
+def _closed_triangles(vertices, faces):
+    """(len(faces), 4, 3) array of triangle outlines closed back on their first corner, one polyline per face"""
+    return vertices[faces[:, [0, 1, 2, 0]]]
+
+def _wireframe_plotter(vertices, faces, line_width):
+    """Off-screen VTK plotter holding the wireframe of the given faces, or None without pyvista"""
+    if pv is None:
+        return None
+    cells = np.hstack([np.full((len(faces), 1), 3, dtype=faces.dtype), faces]).ravel()
+    plotter = pv.Plotter(off_screen=True)
+    plotter.add_mesh(pv.PolyData(vertices, cells), style='wireframe', color='blue', opacity=0.3, line_width=line_width)
+    return plotter
+
+def _render_projection(plotter, bounds, horizontal, vertical, width=1200):
+    """Orthographic render looking down the remaining axis, with the imshow extent mapping its pixels to data coordinates"""
+    lo, hi = bounds
+    pad = 0.05 * max(hi[horizontal] - lo[horizontal], hi[vertical] - lo[vertical])
+    extent = [lo[horizontal] - pad, hi[horizontal] + pad, lo[vertical] - pad, hi[vertical] + pad]
+    height = max(int(round(width * (extent[3] - extent[2]) / (extent[1] - extent[0]))), 1)
+    
+    # The screen's right/up vectors are the horizontal/vertical axes, so the camera sits along their cross product
+    axes = np.eye(3)
+    focal = (lo + hi) / 2
+    plotter.enable_parallel_projection()
+    plotter.camera.focal_point = focal
+    plotter.camera.position = focal + np.cross(axes[horizontal], axes[vertical]) * (hi - lo).max() * 2
+    plotter.camera.up = axes[vertical]
+    plotter.camera.parallel_scale = (extent[3] - extent[2]) / 2
+    plotter.reset_camera_clipping_range()
+    return plotter.screenshot(return_img=True, window_size=(width, height)), extent
+
+def _draw_projection(ax, outlines, plotter, bounds, horizontal, vertical):
+    """Draw the wireframe projected onto two axes, as one VTK render when available, otherwise one LineCollection"""
+    if plotter is None:
+        lines = LineCollection(outlines[..., [horizontal, vertical]], colors='b', alpha=0.3, linewidths=0.3)
+        lines.set_rasterized(True)
+        ax.add_collection(lines)
+        ax.autoscale_view()
+    else:
+        image, extent = _render_projection(plotter, bounds, horizontal, vertical)
+        ax.imshow(image, extent=extent)
+
+def create_mesh_wireframe_view(mesh, model_name, wireframe=None):
     """Create wireframe view to see actual ship structure"""
     fig = plt.figure(figsize=(20, 15))
     vertices = mesh.vertices
-    faces = mesh.faces
+    bounds = mesh.bounds
     
-    # 3D wireframe view
-    ax1 = fig.add_subplot(231, projection='3d')
+    # Draw every face of the decimated mesh when there is one, otherwise sample the full mesh's faces
+    # to avoid overcrowding; the density panels always use every vertex. The orthographic views
+    # carry all the structure, so there is no 3D panel to depth-sort
+    if wireframe is None:
+        wire_vertices, wire_faces = vertices, np.ascontiguousarray(mesh.faces[::20], dtype=np.int32)
+    else:
+        wire_vertices, wire_faces = wireframe.vertices, wireframe.faces
+    plotter = _wireframe_plotter(wire_vertices, wire_faces, line_width=0.3)
+    outlines = _closed_triangles(wire_vertices, wire_faces) if plotter is None else None
     
-    # Draw edges of faces to show structure
-    for face in faces[::10]:  # Sample every 10th face to avoid overcrowding
-        triangle = vertices[face]
-        # Draw triangle edges
-        for i in range(3):
-            start = triangle[i]
-            end = triangle[(i+1)%3]
-            ax1.plot([start[0], end[0]], [start[1], end[1]], [start[2], end[2]], 
-                    'b-', alpha=0.3, linewidth=0.5)
+    # Top view wireframe
+    ax1 = fig.add_subplot(231)
+    _draw_projection(ax1, outlines, plotter, bounds, 0, 2)
     
-    ax1.set_title(f'{model_name} - Wireframe Structure')
-    ax1.set_xlabel('X'); ax1.set_ylabel('Y'); ax1.set_zlabel('Z')
+    ax1.set_title(f'{model_name} - Top View (X-Z) - Structure')
+    ax1.set_xlabel('X'); ax1.set_ylabel('Z')
+    ax1.grid(True, alpha=0.3)
+    ax1.set_aspect('equal')
     
-    # Top view wireframe
+    # Side view wireframe
     ax2 = fig.add_subplot(232)
-    for face in faces[::20]:
-        triangle = vertices[face]
-        triangle_x = triangle[:, 0]
-        triangle_z = triangle[:, 2]
-        # Close the triangle
-        triangle_x = np.append(triangle_x, triangle_x[0])
-        triangle_z = np.append(triangle_z, triangle_z[0])
-        ax2.plot(triangle_x, triangle_z, 'b-', alpha=0.3, linewidth=0.3)
-    
-    ax2.set_title('Top View (X-Z) - Structure')
-    ax2.set_xlabel('X'); ax2.set_ylabel('Z')
+    _draw_projection(ax2, outlines, plotter, bounds, 1, 2)
+    
+    ax2.set_title('Side View (Y-Z) - Structure')
+    ax2.set_xlabel('Y'); ax2.set_ylabel('Z')
     ax2.grid(True, alpha=0.3)
     ax2.set_aspect('equal')
     
-    # Side view wireframe
+    # Front view wireframe
     ax3 = fig.add_subplot(233)
-    for face in faces[::20]:
-        triangle = vertices[face]
-        triangle_y = triangle[:, 1]
-        triangle_z = triangle[:, 2]
-        triangle_y = np.append(triangle_y, triangle_y[0])
-        triangle_z = np.append(triangle_z, triangle_z[0])
-        ax3.plot(triangle_y, triangle_z, 'b-', alpha=0.3, linewidth=0.3)
-    
-    ax3.set_title('Side View (Y-Z) - Structure')
-    ax3.set_xlabel('Y'); ax3.set_ylabel('Z')
+    _draw_projection(ax3, outlines, plotter, bounds, 0, 1)
+    
+    ax3.set_title('Front View (X-Y) - Structure')
+    ax3.set_xlabel('X'); ax3.set_ylabel('Y')
     ax3.grid(True, alpha=0.3)
     ax3.set_aspect('equal')
     
-    # Front view wireframe
-    ax4 = fig.add_subplot(234)
-    for face in faces[::20]:
-        triangle = vertices[face]
-        triangle_x = triangle[:, 0]
-        triangle_y = triangle[:, 1]
-        triangle_x = np.append(triangle_x, triangle_x[0])
-        triangle_y = np.append(triangle_y, triangle_y[0])
-        ax4.plot(triangle_x, triangle_y, 'b-', alpha=0.3, linewidth=0.3)
-    
-    ax4.set_title('Front View (X-Y) - Structure')
-    ax4.set_xlabel('X'); ax4.set_ylabel('Y')
-    ax4.grid(True, alpha=0.3)
-    ax4.set_aspect('equal')
+    if plotter is not None:
+        plotter.close()
     
     # Vertex density plot
-    ax5 = fig.add_subplot(235)
-    hist, xedges, yedges = np.histogram2d(vertices[:, 0], vertices[:, 2], bins=50)
-    im = ax5.imshow(hist.T, origin='lower', extent=[xedges[0], xedges[-1], yedges[0], yedges[-1]], 
+    ax4 = fig.add_subplot(234)
+    hist, xedges, yedges = np.histogram2d(vertices[:, 0], vertices[:, 2], bins=50,
+                                          range=[[bounds[0][0], bounds[1][0]], [bounds[0][2], bounds[1][2]]])
+    hist = hist.astype(np.float32)
+    im = ax4.imshow(hist.T, origin='lower', extent=[xedges[0], xedges[-1], yedges[0], yedges[-1]], 
                     cmap='hot', alpha=0.8)
-    ax5.set_title('Vertex Density (Top View)')
-    ax5.set_xlabel('X'); ax5.set_ylabel('Z')
-    plt.colorbar(im, ax=ax5)
+    ax4.set_title('Vertex Density (Top View)')
+    ax4.set_xlabel('X'); ax4.set_ylabel('Z')
+    plt.colorbar(im, ax=ax4)
     
     # Profile analysis
-    ax6 = fig.add_subplot(236)
-    hist2, xedges2, yedges2 = np.histogram2d(vertices[:, 1], vertices[:, 2], bins=50)
-    im2 = ax6.imshow(hist2.T, origin='lower', extent=[xedges2[0], xedges2[-1], yedges2[0], yedges2[-1]], 
+    ax5 = fig.add_subplot(235)
+    hist2, xedges2, yedges2 = np.histogram2d(vertices[:, 1], vertices[:, 2], bins=50,
+                                             range=[[bounds[0][1], bounds[1][1]], [bounds[0][2], bounds[1][2]]])
+    hist2 = hist2.astype(np.float32)
+    im2 = ax5.imshow(hist2.T, origin='lower', extent=[xedges2[0], xedges2[-1], yedges2[0], yedges2[-1]], 
                      cmap='hot', alpha=0.8)
-    ax6.set_title('Vertex Density (Side View)')
-    ax6.set_xlabel('Y'); ax6.set_ylabel('Z')
-    plt.colorbar(im2, ax=ax6)
+    ax5.set_title('Vertex Density (Side View)')
+    ax5.set_xlabel('Y'); ax5.set_ylabel('Z')
+    plt.colorbar(im2, ax=ax5)
     
     plt.tight_layout()
     plt.savefig(f'{model_name}_wireframe_analysis.png', dpi=150, bbox_inches='tight')
@@ -144,6 +239,13 @@ def create_cross_section_analysis(mesh, model_name):
     
     # Z-axis cross-sections (front to back)
     z_positions = np.linspace(bounds[0][2], bounds[1][2], 6)
+    tolerance = (bounds[1][2] - bounds[0][2]) * 0.02
+    
+    # Sort by Z once so each slice is a contiguous run found by binary search
+    order = np.argsort(vertices[:, 2], kind='stable')
+    sorted_vertices = vertices[order]
+    slice_lo = np.searchsorted(sorted_vertices[:, 2], z_positions - tolerance, side='right')
+    slice_hi = np.searchsorted(sorted_vertices[:, 2], z_positions + tolerance, side='left')
     
     for i, z_pos in enumerate(z_positions):
         if i >= 6: break
@@ -152,9 +254,7 @@ def create_cross_section_analysis(mesh, model_name):
         ax = axes[row, col]
         
         # Find vertices near this Z position
-        tolerance = (bounds[1][2] - bounds[0][2]) * 0.02
-        slice_mask = np.abs(vertices[:, 2] - z_pos) < tolerance
-        slice_vertices = vertices[slice_mask]
+        slice_vertices = sorted_vertices[slice_lo[i]:slice_hi[i]]
         
         if len(slice_vertices) > 0:
             ax.scatter(slice_vertices[:, 0], slice_vertices[:, 1], s=1, alpha=0.6)
@@ -166,9 +266,8 @@ def create_cross_section_analysis(mesh, model_name):
             
             # Find extremes for this slice
             if len(slice_vertices) > 10:
-                x_range = slice_vertices[:, 0].max() - slice_vertices[:, 0].min()
-                y_range = slice_vertices[:, 1].max() - slice_vertices[:, 1].min()
-                ax.text(0.02, 0.98, f'X-range: {x_range:.1f}\nY-range: {y_range:.1f}', 
+                slice_range = slice_vertices.max(axis=0) - slice_vertices.min(axis=0)
+                ax.text(0.02, 0.98, f'X-range: {slice_range[0]:.1f}\nY-range: {slice_range[1]:.1f}', 
                        transform=ax.transAxes, verticalalignment='top',
                        bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
     
@@ -176,6 +275,20 @@ def create_cross_section_analysis(mesh, model_name):
     plt.savefig(f'{model_name}_cross_sections.png', dpi=150, bbox_inches='tight')
     print(f"Cross-section analysis saved as {model_name}_cross_sections.png")
 
+def _bin_indices(values, lo, hi, bins):
+    """int32 histogram bin of each value over [lo, hi], with the top edge in the last bin"""
+    # Widen a flat axis by +/-0.5 like np.histogram2d, so its values land in the middle bin
+    if hi <= lo:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.clip(((values - lo) / (hi - lo) * bins).astype(np.int32), 0, bins - 1)
+
+def _sobel(image):
+    """float32 Sobel edge map, computed on the GPU with cupy when it is installed"""
+    if cp is not None:
+        return cp.asnumpy(gpu_ndimage.sobel(cp.asarray(image)))
+    from scipy import ndimage
+    return ndimage.sobel(image, output=np.float32)
+
 def create_density_maps(mesh, model_name):
     """Create detailed density maps to show ship structure"""
     vertices = mesh.vertices
@@ -183,39 +296,40 @@ def create_density_maps(mesh, model_name):
     
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
     
+    # Bin every axis once; the top and side views share the Z bins
+    bins = 100
+    xi, yi, zi = (_bin_indices(vertices[:, axis], bounds[0][axis], bounds[1][axis], bins) for axis in range(3))
+    hist = np.bincount(xi * bins + zi, minlength=bins * bins).reshape(bins, bins).astype(np.float32)
+    hist2 = np.bincount(yi * bins + zi, minlength=bins * bins).reshape(bins, bins).astype(np.float32)
+    top_extent = [bounds[0][0], bounds[1][0], bounds[0][2], bounds[1][2]]
+    side_extent = [bounds[0][1], bounds[1][1], bounds[0][2], bounds[1][2]]
+    
     # High-resolution density map - Top view
     ax1 = axes[0, 0]
-    hist, xedges, yedges = np.histogram2d(vertices[:, 0], vertices[:, 2], bins=100)
-    im1 = ax1.imshow(hist.T, origin='lower', extent=[xedges[0], xedges[-1], yedges[0], yedges[-1]], 
-                     cmap='plasma', alpha=0.9)
+    im1 = ax1.imshow(hist.T, origin='lower', extent=top_extent, cmap='plasma', alpha=0.9)
     ax1.set_title('High-Res Density Map (Top View)')
     ax1.set_xlabel('X'); ax1.set_ylabel('Z')
     plt.colorbar(im1, ax=ax1)
     
     # High-resolution density map - Side view
     ax2 = axes[0, 1]
-    hist2, xedges2, yedges2 = np.histogram2d(vertices[:, 1], vertices[:, 2], bins=100)
-    im2 = ax2.imshow(hist2.T, origin='lower', extent=[xedges2[0], xedges2[-1], yedges2[0], yedges2[-1]], 
-                     cmap='plasma', alpha=0.9)
+    im2 = ax2.imshow(hist2.T, origin='lower', extent=side_extent, cmap='plasma', alpha=0.9)
     ax2.set_title('High-Res Density Map (Side View)')
     ax2.set_xlabel('Y'); ax2.set_ylabel('Z')
     plt.colorbar(im2, ax=ax2)
     
     # Edge detection on top view
     ax3 = axes[1, 0]
-    from scipy import ndimage
-    edges = ndimage.sobel(hist.T)
-    im3 = ax3.imshow(edges, origin='lower', extent=[xedges[0], xedges[-1], yedges[0], yedges[-1]], 
-                     cmap='gray', alpha=0.9)
+    edges = _sobel(hist.T)
+    im3 = ax3.imshow(edges, origin='lower', extent=top_extent, cmap='gray', alpha=0.9)
     ax3.set_title('Edge Detection (Top View)')
     ax3.set_xlabel('X'); ax3.set_ylabel('Z')
     plt.colorbar(im3, ax=ax3)
     
     # Edge detection on side view
     ax4 = axes[1, 1]
-    edges2 = ndimage.sobel(hist2.T)
-    im4 = ax4.imshow(edges2, origin='lower', extent=[xedges2[0], xedges2[-1], yedges2[0], yedges2[-1]], 
-                     cmap='gray', alpha=0.9)
+    edges2 = _sobel(hist2.T)
+    im4 = ax4.imshow(edges2, origin='lower', extent=side_extent, cmap='gray', alpha=0.9)
     ax4.set_title('Edge Detection (Side View)')
     ax4.set_xlabel('Y'); ax4.set_ylabel('Z')
     plt.colorbar(im4, ax=ax4)
@@ -226,52 +340,57 @@ def create_density_maps(mesh, model_name):
 
 def analyze_ship_features(mesh, model_name):
     """Analyze specific ship features for hardpoint placement"""
-    vertices = mesh.vertices
+    vertices = mesh.vertices.astype(np.float32, copy=False)
     bounds = mesh.bounds
     center = mesh.centroid
     
     print(f"\nDETAILED FEATURE ANALYSIS for {model_name}:")
     print(f"Centroid: [{center[0]:.2f}, {center[1]:.2f}, {center[2]:.2f}]")
     
-    # Analyze front section more carefully
     front_threshold = center[2] - (bounds[1][2] - bounds[0][2]) * 0.25
-    front_vertices = vertices[vertices[:, 2] < front_threshold]
+    rear_threshold = center[2] + (bounds[1][2] - bounds[0][2]) * 0.25
+    # Extents of float32 vertices are exact in float32, so the kernel fills preallocated float32 buffers
+    mins = np.empty((2, 3), dtype=np.float32)
+    maxs = np.empty((2, 3), dtype=np.float32)
+    counts, sums = _section_stats(vertices, front_threshold, rear_threshold, mins, maxs)
     
-    if len(front_vertices) > 0:
+    # Analyze front section more carefully
+    if counts[0] > 0:
         print(f"\nFRONT SECTION (Z < {front_threshold:.2f}):")
-        print(f"  Vertices: {len(front_vertices)}")
-        print(f"  X range: [{front_vertices[:, 0].min():.2f}, {front_vertices[:, 0].max():.2f}]")
-        print(f"  Y range: [{front_vertices[:, 1].min():.2f}, {front_vertices[:, 1].max():.2f}]")
-        print(f"  Z range: [{front_vertices[:, 2].min():.2f}, {front_vertices[:, 2].max():.2f}]")
+        print(f"  Vertices: {counts[0]}")
+        print(f"  X range: [{mins[0, 0]:.2f}, {maxs[0, 0]:.2f}]")
+        print(f"  Y range: [{mins[0, 1]:.2f}, {maxs[0, 1]:.2f}]")
+        print(f"  Z range: [{mins[0, 2]:.2f}, {maxs[0, 2]:.2f}]")
         
         # Look for weapon mount points (areas with consistent geometry)
-        front_center_x = np.mean(front_vertices[:, 0])
-        left_wing = front_vertices[front_vertices[:, 0] < front_center_x - 5]
-        right_wing = front_vertices[front_vertices[:, 0] > front_center_x + 5]
+        front_center_x = sums[0, 0] / counts[0]
+        wing_counts, wing_sums = _wing_sums(vertices, front_threshold, front_center_x - 5, front_center_x + 5)
         
-        if len(left_wing) > 10:
-            left_weapon_point = np.mean(left_wing, axis=0)
+        if wing_counts[0] > 10:
+            left_weapon_point = wing_sums[0] / wing_counts[0]
             print(f"  Left weapon mount candidate: [{left_weapon_point[0]:.2f}, {left_weapon_point[1]:.2f}, {left_weapon_point[2]:.2f}]")
         
-        if len(right_wing) > 10:
-            right_weapon_point = np.mean(right_wing, axis=0)
+        if wing_counts[1] > 10:
+            right_weapon_point = wing_sums[1] / wing_counts[1]
             print(f"  Right weapon mount candidate: [{right_weapon_point[0]:.2f}, {right_weapon_point[1]:.2f}, {right_weapon_point[2]:.2f}]")
     
     # Analyze rear section
-    rear_threshold = center[2] + (bounds[1][2] - bounds[0][2]) * 0.25
-    rear_vertices = vertices[vertices[:, 2] > rear_threshold]
-    
-    if len(rear_vertices) > 0:
+    if counts[1] > 0:
         print(f"\nREAR SECTION (Z > {rear_threshold:.2f}):")
-        print(f"  Vertices: {len(rear_vertices)}")
-        print(f"  X range: [{rear_vertices[:, 0].min():.2f}, {rear_vertices[:, 0].max():.2f}]")
-        print(f"  Y range: [{rear_vertices[:, 1].min():.2f}, {rear_vertices[:, 1].max():.2f}]")
-        print(f"  Z range: [{rear_vertices[:, 2].min():.2f}, {rear_vertices[:, 2].max():.2f}]")
+        print(f"  Vertices: {counts[1]}")
+        print(f"  X range: [{mins[1, 0]:.2f}, {maxs[1, 0]:.2f}]")
+        print(f"  Y range: [{mins[1, 1]:.2f}, {maxs[1, 1]:.2f}]")
+        print(f"  Z range: [{mins[1, 2]:.2f}, {maxs[1, 2]:.2f}]")
         
         # Engine mount analysis
-        rear_center = np.mean(rear_vertices, axis=0)
+        rear_center = sums[1] / counts[1]
         print(f"  Main engine candidate: [{rear_center[0]:.2f}, {rear_center[1]:.2f}, {rear_center[2]:.2f}]")
 
+def _process_model(model):
+    """Visualize and analyze one ship"""
+    mesh = create_detailed_visualizations(model['path'], model['name'])
+    analyze_ship_features(mesh, model['name'])
+
 def main():
     """Create comprehensive visualizations of both models"""
     models = [
@@ -285,15 +404,9 @@ def main():
         }
     ]
     
-    for model in models:
-        if os.path.exists(model['path']):
-            mesh = create_detailed_visualizations(model['path'], model['name'])
-            analyze_ship_features(mesh, model['name'])
-        else:
-            print(f"File not found: {model['path']}")
+    run_per_model(_process_model, models)
 
 if __name__ == "__main__":
-    import os
     try:
         from scipy import ndimage
     except ImportError:
@@ -4,6 +4,8 @@ Verify Actual Positions
 Shows final scaled positions based on actual geometry measurements
 """
 
+import numpy as np
+
 def verify_actual_scaling():
     print("=" * 70)
     print("FINAL VERIFICATION - ACTUAL GEOMETRY-BASED POSITIONS")
@@ -15,26 +17,32 @@ def verify_actual_scaling():
             'native_length': 142.67,
             'desired_length': 20,
             'native_centroid': [32.98, -13.83, -0.22],
-            'weapon_hardpoints': [
-                {'x': 12.5, 'y': -15.5, 'z': -52.6, 'type': 'left_cannon'},
-                {'x': 88.3, 'y': -18.5, 'z': -51.7, 'type': 'right_cannon'},
-            ],
-            'engine_positions': [
-                {'x': 51.5, 'y': -16.9, 'z': 53.0, 'scale': 1.0, 'type': 'main'},
-                {'x': 12.5, 'y': -15.5, 'z': 45.0, 'scale': 0.6, 'type': 'left_secondary'},
-                {'x': 88.3, 'y': -18.5, 'z': 45.0, 'scale': 0.6, 'type': 'right_secondary'},
-            ]
+            'weapon_pos': np.array([
+                [12.5, -15.5, -52.6],
+                [88.3, -18.5, -51.7],
+            ]),
+            'weapon_types': ['left_cannon', 'right_cannon'],
+            'engine_pos': np.array([
+                [51.5, -16.9, 53.0],
+                [12.5, -15.5, 45.0],
+                [88.3, -18.5, 45.0],
+            ]),
+            'engine_scales': np.array([1.0, 0.6, 0.6]),
+            'engine_types': ['main', 'left_secondary', 'right_secondary'],
         },
         'Sky_Predator': {
             'native_length': 1.99,
             'desired_length': 8,
             'native_centroid': [0.28, 0.00, -0.01],
-            'weapon_hardpoints': [
-                {'x': 0.28, 'y': 0.05, 'z': -0.8, 'type': 'front_cannon'},
-            ],
-            'engine_positions': [
-                {'x': 0.63, 'y': -0.01, 'z': 0.62, 'scale': 1.0, 'type': 'main'},
-            ]
+            'weapon_pos': np.array([
+                [0.28, 0.05, -0.8],
+            ]),
+            'weapon_types': ['front_cannon'],
+            'engine_pos': np.array([
+                [0.63, -0.01, 0.62],
+            ]),
+            'engine_scales': np.array([1.0]),
+            'engine_types': ['main'],
         }
     }
     
@@ -50,26 +58,21 @@ def verify_actual_scaling():
         print(f"  Final length: {final_length:.1f} meters")
         
         # Show centroid offset impact
-        centroid = config['native_centroid']
-        scaled_centroid = [c * model_scale for c in centroid]
+        scaled_centroid = np.asarray(config['native_centroid']) * model_scale
         print(f"  Scaled centroid offset: [{scaled_centroid[0]:.2f}, {scaled_centroid[1]:.2f}, {scaled_centroid[2]:.2f}] meters")
         
         # Weapon hardpoints in final scale
         print(f"  Weapon hardpoints (final scale):")
-        for weapon in config['weapon_hardpoints']:
-            scaled_x = weapon['x'] * model_scale
-            scaled_y = weapon['y'] * model_scale
-            scaled_z = weapon['z'] * model_scale
-            print(f"    {weapon['type']}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) meters")
+        scaled_weapons = config['weapon_pos'] * model_scale
+        for weapon_type, (scaled_x, scaled_y, scaled_z) in zip(config['weapon_types'], scaled_weapons):
+            print(f"    {weapon_type}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) meters")
         
         # Engine positions in final scale
         print(f"  Engine positions (final scale):")
-        for engine in config['engine_positions']:
-            scaled_x = engine['x'] * model_scale
-            scaled_y = engine['y'] * model_scale
-            scaled_z = engine['z'] * model_scale
-            effect_scale = engine['scale'] * model_scale * 0.5  # Conservative effect scaling
-            print(f"    {engine['type']}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) effect: {effect_scale:.3f}")
+        scaled_engines = config['engine_pos'] * model_scale
+        effect_scales = config['engine_scales'] * model_scale * 0.5  # Conservative effect scaling
+        for engine_type, (scaled_x, scaled_y, scaled_z), effect_scale in zip(config['engine_types'], scaled_engines, effect_scales):
+            print(f"    {engine_type}: ({scaled_x:.2f}, {scaled_y:.2f}, {scaled_z:.2f}) effect: {effect_scale:.3f}")
         
         # Hit detection
         hit_radius = config['desired_length'] * 0.4  # Conservative hit radius